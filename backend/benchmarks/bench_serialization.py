@@ -0,0 +1,140 @@
+"""Compare CPU time per POST /generate response for the old and pre-rendered serialization paths.
+
+Suite generation is replaced by a prebuilt suite of the requested size, so the numbers
+cover everything the route does after it: raw and smoke exports, `store_export`
+hashing and precompression (into a fresh memory backend per request, so no
+request reuses stored compressions), and response rendering.
+
+- legacy: the pre-rendering route, with `model_dump()` + `json.dumps(indent=2)` exports
+  and the model returned through `response_model`
+- prerendered: the real `backend.main` app and `/generate` route
+- compact: the real route with `"compactJson": true`
+
+    python -m backend.benchmarks.bench_serialization --sizes 50 500 5000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from contextlib import ExitStack
+from typing import Any, Callable, cast
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.main import app as real_app
+from backend.models.schemas import AppDetails, GenerateResponse, SmokeExport, TestCase, TestSuite
+from backend.services.export_store import store_export
+from backend.services.selection import select_smoke_subset
+from backend.services.state import MemoryStateBackend
+
+CATEGORIES = ["happy_path", "adversarial", "edge_case", "hallucination_probe", "prompt_injection", "jailbreak"]
+SEVERITIES = ["critical", "high", "medium", "low"]
+SMOKE_CASES = 20
+PAYLOAD = {
+    "appType": "rag",
+    "systemPrompt": "You answer only from approved policy documents.",
+    "description": "Policy QA assistant",
+    "domain": "e-commerce",
+    "provider": "openai",
+    "outputFormat": "raw",
+    "smokeBudget": {"maxCases": SMOKE_CASES},
+}
+
+
+def build_suite(size: int) -> TestSuite:
+    cases = [
+        TestCase(
+            id=f"tc-{i:05d}",
+            category=cast(Any, CATEGORIES[i % len(CATEGORIES)]),
+            input=f"Customer {i} asks whether an opened item bought {i % 60} days ago can still be returned.",
+            expectedOutput="Explains the 30-day window, cites the policy section, and offers the exchange option.",
+            evalCriteria=["faithfulness", "answer_relevancy", "policy_adherence"],
+            severity=cast(Any, SEVERITIES[i % len(SEVERITIES)]),
+            notes="Checks policy grounding under a realistic customer phrasing.",
+        )
+        for i in range(size)
+    ]
+    return TestSuite(appType="rag", testCases=cases, frameworkConfig={"mode": "live"})
+
+
+def build_legacy_app(suite: TestSuite) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/generate", response_model=GenerateResponse)
+    async def legacy(details: AppDetails) -> GenerateResponse:
+        run = suite.model_copy()
+        content = json.dumps(run.model_dump(), indent=2)
+        smoke_suite, _ = select_smoke_subset(run, max_cases=SMOKE_CASES)
+        smoke_content = json.dumps(smoke_suite.model_dump(), indent=2)
+        digest = store_export(content, "utf-8", "suite.json", "application/json")
+        return GenerateResponse(
+            suite=run,
+            exportFilename="suite.json",
+            exportMimeType="application/json",
+            exportContent=content,
+            exportRef=digest,
+            exportUrl=f"/exports/{digest}",
+            smoke=SmokeExport(
+                suite=smoke_suite,
+                exportFilename="suite_smoke.json",
+                exportMimeType="application/json",
+                exportContent=smoke_content,
+            ),
+        )
+
+    return app
+
+
+def _cpu_ms(call: Callable[[], int], repeats: int) -> tuple[float, int]:
+    size = call()  # warm-up
+    started = time.process_time()
+    for _ in range(repeats):
+        call()
+    return (time.process_time() - started) * 1000 / repeats, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000], help="Cases per suite")
+    parser.add_argument("--repeats", type=int, default=0, help="Requests per path (default: scaled to size)")
+    args = parser.parse_args()
+
+    print(f"{'cases':>6}  {'path':<12}{'cpu ms/resp':>12}{'body KiB':>10}{'speedup':>9}")
+    for size in args.sizes:
+        suite = build_suite(size)
+
+        async def prebuilt(details: AppDetails) -> TestSuite:
+            return suite.model_copy()
+
+        clients = {
+            "legacy": (TestClient(build_legacy_app(suite)), PAYLOAD),
+            "prerendered": (TestClient(real_app), PAYLOAD),
+            "compact": (TestClient(real_app), PAYLOAD | {"compactJson": True}),
+        }
+        repeats = args.repeats or max(3, 2000 // size)
+        baseline = 0.0
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch.dict("os.environ", {"RESPONSE_CACHE_TTL_SECONDS": "0", "OPENAI_API_KEY": "sk-bench"})
+            )
+            stack.enter_context(patch("backend.services.generator.generate_suite", side_effect=prebuilt))
+            stack.enter_context(
+                patch("backend.services.export_store.get_state_backend", side_effect=MemoryStateBackend)
+            )
+            for name, (client, payload) in clients.items():
+
+                def call() -> int:
+                    response = client.post("/generate", json=payload)
+                    response.raise_for_status()
+                    return len(response.content)
+
+                cpu_ms, body_size = _cpu_ms(call, repeats)
+                baseline = baseline or cpu_ms
+                print(f"{size:>6}  {name:<12}{cpu_ms:>12.2f}{body_size / 1024:>10.1f}{baseline / cpu_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Measure /generate throughput as uvicorn worker processes are added.
+
+Runs the server in demo-static mode so the numbers reflect the CPU-bound
+validation and export work rather than provider latency:
+
+    python -m backend.benchmarks.bench_workers --workers 1 2 4 8 --format promptfoo
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+PAYLOAD = {
+    "appType": "rag",
+    "systemPrompt": "You answer only from approved policy documents.",
+    "description": "Policy QA assistant",
+    "domain": "e-commerce",
+    "provider": "openai",
+    "testCaseCount": 50,
+    "outputFormat": "promptfoo",
+    "exampleInteractions": [],
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+async def _drive(base_url: str, payload: dict, concurrency: int, duration: float) -> tuple[int, int]:
+    done = errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal done, errors
+        while time.monotonic() < deadline:
+            response = await client.post(f"{base_url}/generate", json=payload)
+            if response.status_code == 200:
+                done += 1
+            else:
+                errors += 1
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return done, errors
+
+
+def _run(workers: int, payload: dict, concurrency: int, duration: float, state_backend: str) -> float:
+    port = _free_port()
+    env = os.environ | {
+        "DEMO_MODE_ENABLED": "true",
+        "OPENAI_API_KEY": "",
+        "OLLAMA_BASE_URL": "http://127.0.0.1:9",  # refuse fast so demo-static is used
+        "STATE_BACKEND": state_backend,
+        "STATE_SQLITE_PATH": str(Path(tempfile.gettempdir()) / f"crucible-bench-{port}.sqlite3"),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(_wait_ready(base_url))
+        done, errors = asyncio.run(_drive(base_url, payload, concurrency, duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    throughput = done / duration
+    print(f"workers={workers:<3} requests={done:<6} errors={errors:<4} throughput={throughput:8.1f} req/s")
+    return throughput
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--format", default="promptfoo")
+    parser.add_argument("--cases", type=int, choices=[10, 25, 50], default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--state-backend", choices=["memory", "sqlite", "redis"], default="sqlite")
+    args = parser.parse_args()
+
+    payload = PAYLOAD | {"outputFormat": args.format, "testCaseCount": args.cases}
+    print(f"cpu_count={os.cpu_count()} format={args.format} cases={args.cases} concurrency={args.concurrency}")
+    baseline = None
+    rows = []
+    for workers in args.workers:
+        throughput = _run(workers, payload, args.concurrency, args.duration, args.state_backend)
+        baseline = baseline or throughput
+        print(f"            scaling vs first run: {throughput / baseline:.2f}x")
+        rows.append(f"| {workers} | {throughput:.1f} | {throughput / baseline:.2f}x |")
+
+    # Ready to paste into the README's Multi-Worker Serving section.
+    print(f"\n{os.cpu_count()} CPUs, STATE_BACKEND={args.state_backend}, {args.format}, {args.cases} cases\n")
+    print("| Workers | req/s | Scaling |\n|---:|---:|---:|")
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Command-line entry point for generating and running suites without the HTTP server.
+
+    python -m backend.cli generate configs/ --out downloads/ --concurrency 8 --provider-concurrency 2
+    python -m backend.cli run downloads/suite.json --target http://localhost:8080/chat --format ragas
+
+Only the generator and its exporters are imported here; FastAPI is never loaded.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+from dotenv import load_dotenv
+
+from backend.models.schemas import AppDetails, TestSuite
+from backend.services.generator import (
+    RESULT_FORMATS,
+    build_results_export,
+    build_smoke_export,
+    generate_test_suite,
+    resolve_provider,
+)
+from backend.services.runner import (
+    CallableTarget,
+    CaseResult,
+    HttpTarget,
+    RunReport,
+    load_callable_target,
+    percentile,
+    run_suite,
+)
+
+CONFIG_SUFFIXES = {".json", ".yaml", ".yml"}
+MANIFEST_NAME = ".crucible-manifest.json"
+
+
+@dataclass
+class JobResult:
+    source: str
+    status: str  # "generated", "skipped" or "failed"
+    seconds: float = 0.0
+    cases: int = 0
+    output: str | None = None
+    error: str | None = None
+
+
+def _load_details(path: Path) -> AppDetails:
+    text = path.read_text(encoding="utf-8")
+    data = json.loads(text) if path.suffix == ".json" else yaml.safe_load(text)
+    return AppDetails.model_validate(data)
+
+
+def _load_manifest(out_dir: Path) -> dict[str, Any]:
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_manifest(out_dir: Path, manifest: dict[str, Any]) -> None:
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _unique_path(out_dir: Path, filename: str) -> Path:
+    candidate = out_dir / filename
+    stem, suffix = candidate.stem, candidate.suffix
+    counter = 2
+    while candidate.exists():
+        candidate = out_dir / f"{stem}_{counter}{suffix}"
+        counter += 1
+    return candidate
+
+
+def _write_export(out_dir: Path, filename: str, content: str, framework: dict[str, Any]) -> Path:
+    target = _unique_path(out_dir, filename)
+    if framework.get("encoding") == "base64":
+        target.write_bytes(base64.b64decode(content))
+    else:
+        target.write_text(content, encoding="utf-8")
+    return target
+
+
+async def _generate_one(
+    path: Path,
+    in_dir: Path,
+    out_dir: Path,
+    manifest: dict[str, Any],
+    force: bool,
+    global_limit: asyncio.Semaphore,
+    provider_limits: dict[str, asyncio.Semaphore],
+    provider_concurrency: int,
+) -> JobResult:
+    source = path.relative_to(in_dir).as_posix()
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    previous = manifest.get(source, {})
+    if not force and previous.get("hash") == digest and (out_dir / previous.get("output", "")).is_file():
+        return JobResult(source=source, status="skipped", output=previous["output"])
+
+    try:
+        details = _load_details(path)
+    except Exception as exc:
+        return JobResult(source=source, status="failed", error=f"invalid config: {exc}")
+
+    # Key on the provider actually called, so keyless configs that fall back to Ollama share its cap.
+    provider = resolve_provider(details.provider)
+    provider_limit = provider_limits.setdefault(provider, asyncio.Semaphore(provider_concurrency))
+    async with global_limit, provider_limit:
+        started = time.perf_counter()
+        try:
+            suite, filename, _, content = await generate_test_suite(details)
+        except Exception as exc:
+            return JobResult(source=source, status="failed", seconds=time.perf_counter() - started, error=str(exc))
+        seconds = time.perf_counter() - started
+
+    target = _write_export(out_dir, filename, content, suite.frameworkConfig)
+    smoke = build_smoke_export(suite, details)
+    if smoke is not None:
+        smoke_suite, smoke_filename, _, smoke_content = smoke
+        _write_export(out_dir, smoke_filename, smoke_content, smoke_suite.frameworkConfig)
+    manifest[source] = {"hash": digest, "output": target.name}
+    return JobResult(source=source, status="generated", seconds=seconds, cases=suite.totalCases, output=target.name)
+
+
+async def run_generate(
+    in_dir: Path,
+    out_dir: Path,
+    concurrency: int,
+    provider_concurrency: int,
+    force: bool = False,
+) -> list[JobResult]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(out_dir)
+    resolved_out = out_dir.resolve()
+    paths = sorted(
+        p
+        for p in in_dir.rglob("*")
+        if p.is_file() and p.suffix in CONFIG_SUFFIXES and resolved_out not in p.resolve().parents
+    )
+    global_limit = asyncio.Semaphore(concurrency)
+    provider_limits: dict[str, asyncio.Semaphore] = {}
+    try:
+        return await asyncio.gather(
+            *(
+                _generate_one(path, in_dir, out_dir, manifest, force, global_limit, provider_limits, provider_concurrency)
+                for path in paths
+            )
+        )
+    finally:
+        _write_manifest(out_dir, manifest)
+
+
+def _print_summary(results: list[JobResult], wall_seconds: float) -> None:
+    generated = [r for r in results if r.status == "generated"]
+    skipped = [r for r in results if r.status == "skipped"]
+    failed = [r for r in results if r.status == "failed"]
+
+    for result in results:
+        if result.status == "failed":
+            print(f"FAILED  {result.source}: {result.error}", file=sys.stderr)
+        else:
+            print(f"{result.status.upper():<8}{result.source} -> {result.output}")
+
+    print(
+        f"\n{len(results)} inputs: {len(generated)} generated, {len(skipped)} skipped, "
+        f"{len(failed)} failed in {wall_seconds:.2f}s"
+    )
+    if generated:
+        latencies = [r.seconds for r in generated]
+        cases = sum(r.cases for r in generated)
+        print(
+            f"throughput: {len(generated) / wall_seconds:.2f} suites/s, {cases / wall_seconds:.1f} cases/s\n"
+            f"latency: mean {statistics.fmean(latencies):.2f}s, p50 {percentile(latencies, 50):.2f}s, "
+            f"p95 {percentile(latencies, 95):.2f}s, max {max(latencies):.2f}s"
+        )
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    in_dir = Path(args.input_dir)
+    if not in_dir.is_dir():
+        print(f"Input directory not found: {in_dir}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    results = asyncio.run(
+        run_generate(in_dir, Path(args.out), args.concurrency, args.provider_concurrency, force=args.force)
+    )
+    _print_summary(results, time.perf_counter() - started)
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+def _load_suite(path: Path) -> TestSuite:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    # Accept a raw suite export or a saved /generate response.
+    return TestSuite.model_validate(data.get("suite", data))
+
+
+def _print_progress(result: CaseResult, done: int, total: int) -> None:
+    detail = f"{result.seconds:.2f}s" if result.status == "ok" else result.error
+    print(f"[{done}/{total}] {result.status:<6} {result.id} {detail}", file=sys.stderr)
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    suite_path = Path(args.suite)
+    if not suite_path.is_file():
+        print(f"Suite file not found: {suite_path}", file=sys.stderr)
+        return 2
+    suite = _load_suite(suite_path)
+    target: CallableTarget | HttpTarget
+    if args.target_callable:
+        target = load_callable_target(args.target_callable)
+    else:
+        headers = [header.split(":", 1) for header in args.header if ":" in header]
+        target = HttpTarget(
+            args.target,
+            headers={name.strip(): value.strip() for name, value in headers},
+            input_field=args.input_field,
+            output_field=args.output_field,
+            contexts_field=args.contexts_field,
+            max_connections=args.concurrency,
+        )
+
+    async def _run() -> RunReport:
+        async with target:
+            return await run_suite(
+                suite,
+                target,
+                concurrency=args.concurrency,
+                timeout_seconds=args.timeout,
+                retries=args.retries,
+                on_result=_print_progress,
+            )
+
+    report = asyncio.run(_run())
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    filename, _, content, framework = build_results_export(suite, args.format, report.results_by_id())
+    written = _write_export(out_dir, filename, content, framework)
+
+    summary = report.summary()
+    print(
+        f"\n{summary['total']} cases: {summary['succeeded']} ok, {summary['failed']} failed, "
+        f"{summary['retried']} retried in {summary['wallSeconds']:.2f}s -> {written.name}"
+    )
+    if "latency" in summary:
+        latency = summary["latency"]
+        print(
+            f"throughput: {summary['casesPerSecond']:.1f} cases/s\n"
+            f"latency: mean {latency['mean']:.2f}s, p50 {latency['p50']:.2f}s, "
+            f"p95 {latency['p95']:.2f}s, max {latency['max']:.2f}s"
+        )
+    return 1 if summary["failed"] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description="Crucible Eval batch tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Generate suites from a directory of AppDetails YAML/JSON files")
+    generate.add_argument("input_dir", help="Directory containing AppDetails .yaml/.yml/.json files")
+    generate.add_argument("--out", default="downloads", help="Directory for exported files (default: downloads)")
+    generate.add_argument("--concurrency", type=int, default=8, help="Maximum generations in flight overall")
+    generate.add_argument(
+        "--provider-concurrency", type=int, default=2, help="Maximum generations in flight per provider"
+    )
+    generate.add_argument("--force", action="store_true", help="Regenerate inputs even if unchanged since last run")
+    generate.set_defaults(func=_cmd_generate)
+
+    run = subparsers.add_parser("run", help="Run a suite against a target app and export the filled-in results")
+    run.add_argument("suite", help="Suite JSON (a raw export or a saved /generate response)")
+    target = run.add_mutually_exclusive_group(required=True)
+    target.add_argument("--target", help="HTTP endpoint that accepts POST {input} and returns {output, contexts}")
+    target.add_argument("--target-callable", help="Python callable as package.module:function")
+    run.add_argument("--format", choices=sorted(RESULT_FORMATS), default="ragas", help="Export format (default: ragas)")
+    run.add_argument("--out", default="downloads", help="Directory for the exported file (default: downloads)")
+    run.add_argument("--concurrency", type=int, default=8, help="Maximum target calls in flight")
+    run.add_argument("--timeout", type=float, default=30, help="Seconds allowed per attempt")
+    run.add_argument("--retries", type=int, default=2, help="Retries per case after a failed attempt")
+    run.add_argument("--header", action="append", default=[], help="Extra HTTP header as 'Name: value'; repeatable")
+    run.add_argument("--input-field", default="input", help="Request JSON field for the case input")
+    run.add_argument("--output-field", default="output", help="Response JSON field holding the answer")
+    run.add_argument("--contexts-field", default="contexts", help="Response JSON field holding retrieved contexts")
+    run.set_defaults(func=_cmd_run)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
+from backend.routers.admin import router as admin_router
+from backend.routers.exports import router as exports_router
 from backend.routers.generate import router as generate_router
+from backend.routers.run import router as run_router
+from backend.services.ollama_readiness import run_warmup_loop, warmup_enabled
 
 load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 
-app = FastAPI(title="Crucible Eval API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    warmup = asyncio.create_task(run_warmup_loop()) if warmup_enabled() else None
+    yield
+    if warmup is not None:
+        warmup.cancel()
+
+
+app = FastAPI(title="Crucible Eval API", version="0.1.0", lifespan=lifespan)
 
 origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
 app.add_middleware(
@@ -28,3 +44,6 @@ async def health() -> dict[str, str]:
 
 
 app.include_router(generate_router)
+app.include_router(exports_router)
+app.include_router(admin_router)
+app.include_router(run_router)
@@ -8,7 +8,20 @@ from pydantic import BaseModel, Field, model_validator
 
 AppType = Literal["rag", "chatbot", "agent", "codegen", "custom"]
 Provider = Literal["openai", "anthropic", "google", "ollama"]
-OutputFormat = Literal["promptfoo", "deepeval", "ragas", "raw"]
+OutputFormat = Literal[
+    "promptfoo",
+    "promptfoo-optimized",
+    "deepeval",
+    "deepeval-sharded",
+    "ragas",
+    "ragas-parquet",
+    "ragas-arrow",
+    "ragas-jsonl",
+    "raw",
+]
+# Formats with runtime fields (`answer`/`actual_output`, contexts) the runner can fill.
+ResultFormat = Literal["ragas", "ragas-jsonl", "ragas-parquet", "ragas-arrow", "deepeval"]
+ExportEncoding = Literal["utf-8", "base64"]
 Severity = Literal["critical", "high", "medium", "low"]
 
 TestCategory = Literal[
@@ -29,6 +42,19 @@ class ExampleInteraction(BaseModel):
     output: str = Field(min_length=1)
 
 
+class SmokeBudget(BaseModel):
+    maxCases: int | None = Field(default=None, ge=1)
+    maxTokens: int | None = Field(default=None, ge=1)
+    maxSeconds: float | None = Field(default=None, gt=0)
+    seed: int = 0
+
+    @model_validator(mode="after")
+    def require_a_limit(self) -> "SmokeBudget":
+        if self.maxCases is None and self.maxTokens is None and self.maxSeconds is None:
+            raise ValueError("smokeBudget needs at least one of maxCases, maxTokens or maxSeconds")
+        return self
+
+
 def _default_provider() -> Provider:
     value = os.getenv("DEFAULT_PROVIDER", "openai").strip().lower()
     allowed = {"openai", "anthropic", "google", "ollama"}
@@ -44,6 +70,12 @@ class AppDetails(BaseModel):
     provider: Provider = Field(default_factory=_default_provider)
     testCaseCount: Literal[10, 25, 50] = 25
     outputFormat: OutputFormat = "raw"
+    smokeBudget: SmokeBudget | None = None
+    mutationsPerSeed: int = Field(default=0, ge=0, le=100)
+    mutationSeed: int = 0
+    compactJson: bool = False
+    # Cases per module in `deepeval-sharded` exports; 0 shards by category.
+    deepevalShardSize: int = Field(default=0, ge=0, le=10000)
 
 
 class TestCase(BaseModel):
@@ -76,8 +108,37 @@ class TestSuite(BaseModel):
         return self
 
 
-class GenerateResponse(BaseModel):
+class SmokeExport(BaseModel):
     suite: TestSuite
     exportFilename: str
     exportMimeType: str
     exportContent: str
+    exportEncoding: ExportEncoding = "utf-8"
+
+
+class GenerateResponse(BaseModel):
+    suite: TestSuite
+    exportFilename: str
+    exportMimeType: str
+    exportContent: str | None = None
+    exportEncoding: ExportEncoding = "utf-8"
+    exportRef: str | None = None
+    exportUrl: str | None = None
+    smoke: SmokeExport | None = None
+
+
+class RunTarget(BaseModel):
+    url: str = Field(pattern=r"^https?://")
+    headers: dict[str, str] = Field(default_factory=dict)
+    inputField: str = "input"
+    outputField: str = "output"
+    contextsField: str = "contexts"
+
+
+class RunRequest(BaseModel):
+    suite: TestSuite
+    target: RunTarget
+    outputFormat: ResultFormat = "ragas"
+    concurrency: int = Field(default=8, ge=1, le=64)
+    timeoutSeconds: float = Field(default=30, gt=0, le=600)
+    retries: int = Field(default=2, ge=0, le=5)
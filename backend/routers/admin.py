@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import hmac
+import os
+from typing import Any
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from backend.services.profiling import get_profile_store, profiling_enabled
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _authorize(token: str | None) -> None:
+    if not profiling_enabled():
+        raise HTTPException(status_code=503, detail="Profiling is disabled")
+    expected = os.getenv("ADMIN_TOKEN", "").strip()
+    if not expected:
+        raise HTTPException(status_code=503, detail="Admin endpoints are disabled until ADMIN_TOKEN is configured")
+    if not hmac.compare_digest(token or "", expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/profiles")
+async def list_profiles(x_admin_token: str | None = Header(default=None)) -> list[dict[str, Any]]:
+    _authorize(x_admin_token)
+    return get_profile_store().list()
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, x_admin_token: str | None = Header(default=None)) -> FileResponse:
+    _authorize(x_admin_token)
+    path = get_profile_store().path_for(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=path.name)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import re
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from backend.services.export_store import (
+    etag_matches,
+    forget_export,
+    load_export_body,
+    load_export_meta,
+    negotiate_encoding,
+)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{digest}")
+async def get_export(digest: str, request: Request) -> Response:
+    meta = load_export_meta(digest) if DIGEST_PATTERN.match(digest) else None
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Export not found or expired")
+
+    headers = {"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match", ""), digest):
+        return Response(status_code=304, headers=headers | {"ETag": f'"{digest}"'})
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), meta["encodings"])
+    body = load_export_body(digest, encoding)
+    if body is None and encoding != "identity":
+        # A compressed copy was evicted; the identity body is still a valid reply.
+        encoding = "identity"
+        body = load_export_body(digest, encoding)
+    if body is None:
+        forget_export(digest, meta["encodings"])
+        raise HTTPException(status_code=404, detail="Export not found or expired")
+
+    headers["ETag"] = f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+    headers["Content-Disposition"] = f'attachment; filename="{meta["filename"]}"'
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=meta["mimeType"], headers=headers)
@@ -1,26 +1,94 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from contextlib import nullcontext
 
-from backend.models.schemas import AppDetails, GenerateResponse
-from backend.services.generator import generate_test_suite
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from backend.models.schemas import AppDetails, GenerateResponse, SmokeExport
+from backend.services.export_store import store_export
+from backend.services.exporters.ragas import iter_ragas_jsonl
+from backend.services.generator import build_smoke_export, generate_suite, generate_test_suite
+from backend.services.profiling import PROFILE_ID_HEADER, capture_profile, profile_requested
 
 router = APIRouter(prefix="/generate", tags=["generate"])
 
 
+def _http_error(exc: Exception) -> HTTPException:
+    message = str(exc)
+    if "not configured" in message or "disabled" in message:
+        return HTTPException(status_code=503, detail=message)
+    if "rate limit exceeded" in message:
+        return HTTPException(status_code=429, detail=message)
+    return HTTPException(status_code=400, detail=message)
+
+
 @router.post("", response_model=GenerateResponse)
-async def generate(details: AppDetails) -> GenerateResponse:
+async def generate(
+    details: AppDetails,
+    request: Request,
+    exportInline: bool = True,
+) -> Response:
+    profile = nullcontext({})
+    if profile_requested(request.headers, request.query_params):
+        profile = capture_profile(f"POST /generate {details.provider} {details.outputFormat}")
+    captured: dict[str, str] = {}
     try:
-        suite, filename, mime_type, content = await generate_test_suite(details)
-    except Exception as exc:
-        message = str(exc)
-        if "not configured" in message or "disabled" in message:
-            raise HTTPException(status_code=503, detail=message) from exc
-        raise HTTPException(status_code=400, detail=message) from exc
+        async with profile as captured:
+            try:
+                suite, filename, mime_type, content = await generate_test_suite(details)
+            except Exception as exc:
+                raise _http_error(exc) from exc
+    except HTTPException as exc:
+        # Failed requests are the ones most worth profiling, so point the error at its profile too.
+        if "id" in captured:
+            exc.headers = (exc.headers or {}) | {PROFILE_ID_HEADER: captured["id"]}
+        raise
+
+    smoke = None
+    smoke_export = build_smoke_export(suite, details)
+    if smoke_export is not None:
+        smoke_suite, smoke_filename, smoke_mime_type, smoke_content = smoke_export
+        smoke = SmokeExport.model_construct(
+            suite=smoke_suite,
+            exportFilename=smoke_filename,
+            exportMimeType=smoke_mime_type,
+            exportContent=smoke_content,
+            exportEncoding=smoke_suite.frameworkConfig.get("encoding", "utf-8"),
+        )
 
-    return GenerateResponse(
+    encoding = suite.frameworkConfig.get("encoding", "utf-8")
+    # Hashing and precompressing large exports is CPU-bound; keep it off the event loop.
+    digest = await run_in_threadpool(store_export, content, encoding, filename, mime_type)
+    # Every part is already validated, so skip response_model revalidation and let
+    # pydantic-core render the whole body in one pass. `response_model` stays for the schema.
+    body = GenerateResponse.model_construct(
         suite=suite,
         exportFilename=filename,
         exportMimeType=mime_type,
-        exportContent=content,
+        exportContent=content if exportInline else None,
+        exportEncoding=encoding,
+        exportRef=digest,
+        exportUrl=f"/exports/{digest}",
+        smoke=smoke,
+    )
+    response = Response(content=body.model_dump_json(), media_type="application/json")
+    if "id" in captured:
+        response.headers[PROFILE_ID_HEADER] = captured["id"]
+    return response
+
+
+@router.post("/ragas.jsonl")
+async def generate_ragas_jsonl(details: AppDetails) -> StreamingResponse:
+    """Generate a suite and stream its Ragas dataset as JSON Lines, one row per chunk."""
+    try:
+        suite = await generate_suite(details)
+    except Exception as exc:
+        raise _http_error(exc) from exc
+    filename = f"crucible_{suite.appType}_ragas-jsonl.jsonl"
+    return StreamingResponse(
+        iter_ragas_jsonl(suite.model_dump()),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.models.schemas import RunRequest
+from backend.services.generator import build_results_export
+from backend.services.runner import CaseResult, HttpTarget, build_report, iter_run
+
+router = APIRouter(prefix="/run", tags=["run"])
+
+
+def _authorize(url: str) -> None:
+    # The server calls the URL it is given, so the endpoint is opt-in and limited to an explicit host list.
+    if os.getenv("RUNNER_API_ENABLED", "false").strip().lower() not in {"1", "true", "yes", "on"}:
+        raise HTTPException(status_code=503, detail="Runner API is disabled")
+    allowed = {host.strip().lower() for host in os.getenv("RUNNER_ALLOWED_HOSTS", "").split(",") if host.strip()}
+    if not allowed:
+        raise HTTPException(status_code=503, detail="Runner API is disabled until RUNNER_ALLOWED_HOSTS is set")
+    if (urlparse(url).hostname or "").lower() not in allowed:
+        raise HTTPException(status_code=403, detail="Target host is not in RUNNER_ALLOWED_HOSTS")
+
+
+async def _stream(request: RunRequest) -> AsyncIterator[str]:
+    total = len(request.suite.testCases)
+    results: list[CaseResult] = []
+    started = time.perf_counter()
+    spec = request.target
+    async with HttpTarget(
+        spec.url,
+        headers=spec.headers,
+        input_field=spec.inputField,
+        output_field=spec.outputField,
+        contexts_field=spec.contextsField,
+        max_connections=request.concurrency,
+    ) as target:
+        async for result in iter_run(
+            request.suite,
+            target,
+            concurrency=request.concurrency,
+            timeout_seconds=request.timeoutSeconds,
+            retries=request.retries,
+        ):
+            results.append(result)
+            yield json.dumps({"type": "result", "completed": len(results), "total": total} | result.to_dict()) + "\n"
+
+    report = build_report(request.suite, results, time.perf_counter() - started)
+    summary: dict[str, Any] = {"type": "summary", "report": report.summary()}
+    try:
+        filename, mime_type, content, framework = build_results_export(
+            request.suite, request.outputFormat, report.results_by_id()
+        )
+    except Exception as exc:
+        summary["error"] = str(exc)
+    else:
+        summary |= {
+            "exportFilename": filename,
+            "exportMimeType": mime_type,
+            "exportContent": content,
+            "exportEncoding": framework.get("encoding", "utf-8"),
+        }
+    yield json.dumps(summary) + "\n"
+
+
+@router.post("")
+async def run(request: RunRequest) -> StreamingResponse:
+    """Run a suite against an HTTP target, streaming one NDJSON line per finished case and a final summary."""
+    _authorize(request.target.url)
+    return StreamingResponse(_stream(request), media_type="application/x-ndjson")
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Any
+
+from backend.models.schemas import TestSuite
+
+REQUIRED_CATEGORIES = [
+    "happy_path",
+    "adversarial",
+    "edge_case",
+    "hallucination_probe",
+    "prompt_injection",
+]
+# Categories that count toward the adversarial share; keep in step with prompts/system_prompt.txt.
+ADVERSARIAL_CATEGORIES = ["adversarial", "prompt_injection", "jailbreak", "edge_case"]
+ADVERSARIAL_MINIMUM_PERCENT = 30
+
+
+def compute_coverage(suite: TestSuite) -> dict[str, Any]:
+    """Summarize category/severity distribution and check it against the prompt requirements."""
+    categories = Counter(case.category for case in suite.testCases)
+    severities = Counter(case.severity for case in suite.testCases)
+    total = len(suite.testCases)
+    adversarial = sum(categories[name] for name in ADVERSARIAL_CATEGORIES)
+    adversarial_percent = round(100 * adversarial / total, 1) if total else 0.0
+    missing = [name for name in REQUIRED_CATEGORIES if not categories[name]]
+    return {
+        "categories": dict(sorted(categories.items())),
+        "severities": dict(sorted(severities.items())),
+        "adversarialPercent": adversarial_percent,
+        "missingCategories": missing,
+        "meetsRequirements": not missing and adversarial_percent >= ADVERSARIAL_MINIMUM_PERCENT,
+    }
+
+
+def plan_top_up(suite: TestSuite) -> dict[str, int]:
+    """Return how many extra cases of each category would close the coverage gaps.
+
+    Every missing required category gets one case; if the adversarial share is
+    still below the minimum, the smallest number of adversarial cases that lifts
+    it over the threshold is spread across the adversarial categories.
+    """
+    categories = Counter(case.category for case in suite.testCases)
+    plan = {name: 1 for name in REQUIRED_CATEGORIES if not categories[name]}
+
+    total = len(suite.testCases) + sum(plan.values())
+    adversarial = sum(categories[name] + plan.get(name, 0) for name in ADVERSARIAL_CATEGORIES)
+    share = ADVERSARIAL_MINIMUM_PERCENT / 100
+    shortfall = max(0, math.ceil((share * total - adversarial) / (1 - share) - 1e-9))
+    for index in range(shortfall):
+        name = ADVERSARIAL_CATEGORIES[index % len(ADVERSARIAL_CATEGORIES)]
+        plan[name] = plan.get(name, 0) + 1
+    return plan
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Callable
+
+from backend.services.state import get_state_backend
+
+# Preference order when a client accepts several encodings equally.
+ENCODING_PREFERENCE = ["zstd", "br", "gzip"]
+
+
+def _compressors() -> dict[str, Callable[[bytes], bytes]]:
+    compressors: dict[str, Callable[[bytes], bytes]] = {"gzip": lambda data: gzip.compress(data, compresslevel=6)}
+    try:
+        import brotli
+
+        compressors["br"] = lambda data: brotli.compress(data, quality=5)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        compressors["zstd"] = lambda data: zstandard.ZstdCompressor(level=3).compress(data)
+    except ImportError:
+        pass
+    return compressors
+
+
+def _export_ttl() -> float:
+    return float(os.getenv("EXPORT_TTL_SECONDS", "86400"))
+
+
+def store_export(content: str, encoding: str, filename: str, mime_type: str) -> str:
+    """Store an export under its content hash, precompressing it once per available encoding.
+
+    Returns the hex digest used as both the export reference and its ETag.
+    """
+    raw = base64.b64decode(content) if encoding == "base64" else content.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    state = get_state_backend()
+    ttl = _export_ttl()
+    # An LRU-capped backend can evict bodies while their meta survives, so only skip
+    # the write when every body the meta lists is still present.
+    meta_value = state.get(f"export:{digest}:meta")
+    if meta_value is not None:
+        stored = ["identity", *json.loads(meta_value)["encodings"]]
+        if all(state.get(f"export:{digest}:{name}") is not None for name in stored):
+            return digest
+
+    encodings = []
+    for name, compress in _compressors().items():
+        compressed = compress(raw)
+        if len(compressed) < len(raw):
+            state.set(f"export:{digest}:{name}", compressed, ttl)
+            encodings.append(name)
+    state.set(f"export:{digest}:identity", raw, ttl)
+    meta = {"filename": filename, "mimeType": mime_type, "size": len(raw), "encodings": encodings}
+    state.set(f"export:{digest}:meta", json.dumps(meta).encode("utf-8"), ttl)
+    return digest
+
+
+def load_export_meta(digest: str) -> dict[str, Any] | None:
+    meta = get_state_backend().get(f"export:{digest}:meta")
+    return json.loads(meta) if meta is not None else None
+
+
+def load_export_body(digest: str, encoding: str) -> bytes | None:
+    return get_state_backend().get(f"export:{digest}:{encoding}")
+
+
+def forget_export(digest: str, encodings: list[str]) -> None:
+    """Drop an export whose identity body was evicted, so its meta expires with it."""
+    state = get_state_backend()
+    for name in ["meta", "identity", *encodings]:
+        state.delete(f"export:{digest}:{name}")
+
+
+def negotiate_encoding(accept_encoding: str, available: list[str]) -> str:
+    """Pick the best stored encoding for an `Accept-Encoding` header, or `identity`."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token] = quality
+
+    best, best_quality = "identity", 0.0
+    for name in ENCODING_PREFERENCE:
+        if name not in available:
+            continue
+        quality = weights.get(name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def etag_matches(if_none_match: str, digest: str) -> bool:
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == digest:
+            return True
+    return False
@@ -1,28 +1,42 @@
 from __future__ import annotations
 
+import io
 import json
+import zipfile
 from typing import Any
 
 
-def build_deepeval_config(suite: dict[str, Any]) -> str:
+def build_deepeval_config(suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None) -> str:
     lines = [
         "from deepeval.test_case import LLMTestCase",
         "from deepeval.dataset import EvaluationDataset",
         "",
-        "# TODO: Populate actual_output by running your LLM on each input",
-        "# TODO: Populate retrieval_context by running your RAG retriever on each input",
-        "",
-        "test_cases = [",
     ]
+    if results is None:
+        lines.extend(
+            [
+                "# TODO: Populate actual_output by running your LLM on each input",
+                "# TODO: Populate retrieval_context by running your RAG retriever on each input",
+                "",
+            ]
+        )
+    lines.append("test_cases = [")
 
     for case in suite.get("testCases", []):
+        result = (results or {}).get(case.get("id", ""))
+        if result is None:
+            actual_output = "        actual_output='',  # fill at runtime"
+            retrieval_context = "        retrieval_context=[]  # fill at runtime"
+        else:
+            actual_output = f"        actual_output={json.dumps(result.get('output', ''))},"
+            retrieval_context = f"        retrieval_context={json.dumps(list(result.get('contexts', [])))}"
         lines.extend(
             [
                 "    LLMTestCase(",
                 f"        input={json.dumps(case.get('input', ''))},",
-                "        actual_output='',  # fill at runtime",
+                actual_output,
                 f"        expected_output={json.dumps(case.get('expectedOutput') or '')},",
-                "        retrieval_context=[]  # fill at runtime",
+                retrieval_context,
                 "    ),",
             ]
         )
@@ -36,3 +50,155 @@ def build_deepeval_config(suite: dict[str, Any]) -> str:
         ]
     )
     return "\n".join(lines)
+
+
+SHARD_PACKAGE = "crucible_deepeval"
+
+SHARD_CONFTEST = '''"""Shared fixtures for the sharded Crucible DeepEval suite.
+
+Point CRUCIBLE_TARGET at a callable ("package.module:function") that takes a test input
+and returns the model output as a string, or a dict with "output" and optional
+"retrieval_context". Async callables are supported. Each shard module calls the target
+for all of its cases concurrently (CRUCIBLE_TARGET_CONCURRENCY, default 8) before its
+tests run, so run with `--dist loadfile` to keep each shard on one xdist worker.
+"""
+import asyncio
+import importlib
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from deepeval.metrics import GEval
+from deepeval.test_case import LLMTestCaseParams
+
+
+def _load_target():
+    spec = os.environ.get("CRUCIBLE_TARGET", "")
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise pytest.UsageError("Set CRUCIBLE_TARGET=package.module:function to the app under test")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _call(target, text):
+    result = target(text)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    if isinstance(result, dict):
+        return str(result.get("output", "")), list(result.get("retrieval_context") or [])
+    return str(result), []
+
+
+@pytest.fixture(scope="session")
+def target():
+    return _load_target()
+
+
+@pytest.fixture(scope="module")
+def actual_outputs(request, target):
+    """Fill actual_output/retrieval_context for every case in the current shard concurrently."""
+    cases = request.module.CASES
+    workers = int(os.environ.get("CRUCIBLE_TARGET_CONCURRENCY", "8"))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda case: _call(target, case["input"]), cases)
+        return {case["id"]: result for case, result in zip(cases, results)}
+
+
+@pytest.fixture(scope="session")
+def metrics_for():
+    params = [
+        LLMTestCaseParams.INPUT,
+        LLMTestCaseParams.ACTUAL_OUTPUT,
+        LLMTestCaseParams.EXPECTED_OUTPUT,
+    ]
+
+    def build(criteria):
+        names = criteria or ["task_success"]
+        return [
+            GEval(
+                name=name,
+                criteria=f"Judge whether the actual output satisfies {name.replace('_', ' ')} for the input, "
+                "consistent with the expected output.",
+                evaluation_params=params,
+            )
+            for name in names
+        ]
+
+    return build
+'''
+
+SHARD_README = """Sharded DeepEval suite generated by Crucible Eval.
+
+    pip install deepeval pytest pytest-xdist
+    CRUCIBLE_TARGET=my_app.eval:answer pytest -n auto --dist loadfile
+
+Each test_*.py module is one shard; its cases run as parametrized tests.
+"""
+
+
+def _shard_cases(suite: dict[str, Any], shard_size: int) -> dict[str, list[dict[str, Any]]]:
+    shards: dict[str, list[dict[str, Any]]] = {}
+    cases = suite.get("testCases", [])
+    if shard_size > 0:
+        for start in range(0, len(cases), shard_size):
+            shards[f"shard_{start // shard_size + 1:03d}"] = cases[start : start + shard_size]
+        return shards
+    for case in cases:
+        shards.setdefault(str(case.get("category") or "unknown"), []).append(case)
+    return shards
+
+
+def _render_shard_module(label: str, cases: list[dict[str, Any]]) -> str:
+    lines = [
+        f'"""Crucible DeepEval shard: {label} ({len(cases)} cases)."""',
+        "import pytest",
+        "from deepeval import assert_test",
+        "from deepeval.test_case import LLMTestCase",
+        "",
+        "CASES = [",
+    ]
+    for case in cases:
+        record = {
+            "id": str(case.get("id", "")),
+            "category": str(case.get("category", "unknown")),
+            "severity": str(case.get("severity", "medium")),
+            "input": str(case.get("input", "")),
+            "expected_output": str(case.get("expectedOutput") or ""),
+            "criteria": [str(item) for item in case.get("evalCriteria", [])],
+        }
+        lines.append(f"    {json.dumps(record, ensure_ascii=False)},")
+    lines.extend(
+        [
+            "]",
+            "",
+            "",
+            '@pytest.mark.parametrize("case", CASES, ids=[case["id"] for case in CASES])',
+            "def test_case(case, actual_outputs, metrics_for):",
+            '    actual_output, retrieval_context = actual_outputs[case["id"]]',
+            "    test_case = LLMTestCase(",
+            '        input=case["input"],',
+            "        actual_output=actual_output,",
+            '        expected_output=case["expected_output"],',
+            "        retrieval_context=retrieval_context,",
+            "    )",
+            '    assert_test(test_case, metrics_for(case["criteria"]))',
+            "",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def build_deepeval_sharded(suite: dict[str, Any], shard_size: int = 0) -> bytes:
+    """Build a zip of pytest modules, one per category or per `shard_size` cases.
+
+    The package is meant for `pytest -n auto --dist loadfile`, so shards run on
+    separate cores while the conftest fills each shard's outputs concurrently.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(f"{SHARD_PACKAGE}/conftest.py", SHARD_CONFTEST)
+        archive.writestr(f"{SHARD_PACKAGE}/README.txt", SHARD_README)
+        for label, cases in _shard_cases(suite, shard_size).items():
+            archive.writestr(f"{SHARD_PACKAGE}/test_{label}.py", _render_shard_module(label, cases))
+    return buffer.getvalue()
@@ -18,6 +18,22 @@ PROVIDER_PREFIX = {
     "ollama": "ollama:chat",
 }
 
+OPTIMIZED_RUBRIC = (
+    "For this {{category}} test case, evaluate whether the assistant response satisfies every one of these "
+    "criteria: {{criteria}}. It should correctly address the user request '{{input}}' and align with the "
+    "expected behavior '{{expected}}' without unsupported claims. Fail the response if any criterion is not met."
+)
+SIMILAR_THRESHOLD = 0.75
+
+
+def estimate_grader_calls(suite: dict[str, Any]) -> dict[str, int]:
+    """Estimated `llm-rubric` grader calls per run for the standard and optimized exports."""
+    cases = suite.get("testCases", [])
+    return {
+        "standard": sum(len(case.get("evalCriteria", [])) for case in cases),
+        "optimized": sum(1 for case in cases if case.get("evalCriteria")),
+    }
+
 
 def _build_rubric(case: dict[str, Any], criterion: str) -> str:
     normalized = criterion.replace("_", " ").strip()
@@ -31,13 +47,29 @@ def _build_rubric(case: dict[str, Any], criterion: str) -> str:
     )
 
 
-def build_promptfoo_config(suite: dict[str, Any], provider: str) -> str:
+def _provider_target(provider: str) -> str:
+    model_override = os.getenv("DEFAULT_MODEL_NAME", "").strip()
+    if model_override:
+        return f"{PROVIDER_PREFIX.get(provider, 'openai')}:{model_override}"
+    return PROVIDER_TARGETS.get(provider, "openai:gpt-4o")
+
+
+def _dump_with_estimate(suite: dict[str, Any], payload: dict[str, Any]) -> str:
+    calls = estimate_grader_calls(suite)
+    header = f"# Estimated grader calls per run: standard={calls['standard']}, optimized={calls['optimized']}\n"
+    return header + yaml.safe_dump(payload, sort_keys=False)
+
+
+def build_promptfoo_config(suite: dict[str, Any], provider: str, optimized: bool = False) -> str:
+    if optimized:
+        return _build_optimized_config(suite, provider)
+
     tests = []
     for case in suite.get("testCases", []):
         assertions = []
         if case.get("expectedOutput"):
             assertions.append(
-                {"type": "similar", "value": case["expectedOutput"], "threshold": 0.75}
+                {"type": "similar", "value": case["expectedOutput"], "threshold": SIMILAR_THRESHOLD}
             )
         for criterion in case.get("evalCriteria", []):
             assertions.append({"type": "llm-rubric", "value": _build_rubric(case, str(criterion))})
@@ -50,15 +82,62 @@ def build_promptfoo_config(suite: dict[str, Any], provider: str) -> str:
             }
         )
 
-    model_override = os.getenv("DEFAULT_MODEL_NAME", "").strip()
-    provider_target = PROVIDER_TARGETS.get(provider, "openai:gpt-4o")
-    if model_override:
-        provider_target = f"{PROVIDER_PREFIX.get(provider, 'openai')}:{model_override}"
-
     payload = {
         "description": "Generated by Crucible Eval",
         "prompts": ["{{input}}"],
-        "providers": [provider_target],
+        "providers": [_provider_target(provider)],
         "tests": tests,
     }
-    return yaml.safe_dump(payload, sort_keys=False)
+    return _dump_with_estimate(suite, payload)
+
+
+def _build_optimized_config(suite: dict[str, Any], provider: str) -> str:
+    """One multi-criterion rubric per case, defined once in `defaultTest` and filled from `vars`.
+
+    Grader calls drop from one per criterion to one per case, and the input and
+    expected output appear once per case instead of once per assertion. Cases
+    without criteria keep the standard export's assertions, including `is-json`.
+    """
+    cases = suite.get("testCases", [])
+    all_expected = bool(cases) and all(case.get("expectedOutput") for case in cases)
+    all_criteria = bool(cases) and all(case.get("evalCriteria") for case in cases)
+    similar = {"type": "similar", "value": "{{expected}}", "threshold": SIMILAR_THRESHOLD}
+
+    tests = []
+    for case in cases:
+        criteria = [str(item).replace("_", " ").strip() for item in case.get("evalCriteria", [])]
+        test: dict[str, Any] = {
+            "description": f"{case.get('id', 'case')} [{case.get('category', 'unknown')}]",
+            "vars": {
+                "input": case.get("input", ""),
+                "expected": case.get("expectedOutput") or "",
+                "category": str(case.get("category") or "general").replace("_", " "),
+                "criteria": "; ".join(criteria),
+            },
+        }
+        assertions: list[dict[str, Any]] = []
+        if case.get("expectedOutput") and not all_expected:
+            assertions.append(dict(similar))
+        if criteria and not all_criteria:
+            assertions.append({"type": "llm-rubric", "value": OPTIMIZED_RUBRIC})
+        if not case.get("expectedOutput") and not criteria:
+            assertions.append({"type": "is-json"})
+        if assertions:
+            test["assert"] = assertions
+        tests.append(test)
+
+    default_asserts: list[dict[str, Any]] = []
+    if all_expected:
+        default_asserts.append(similar)
+    if all_criteria:
+        default_asserts.append({"type": "llm-rubric", "value": OPTIMIZED_RUBRIC})
+
+    payload: dict[str, Any] = {
+        "description": "Generated by Crucible Eval (grader-optimized)",
+        "prompts": ["{{input}}"],
+        "providers": [_provider_target(provider)],
+    }
+    if default_asserts:
+        payload["defaultTest"] = {"assert": default_asserts}
+    payload["tests"] = tests
+    return _dump_with_estimate(suite, payload)
@@ -1,9 +1,27 @@
 from __future__ import annotations
 
-from typing import Any
+import json
+from typing import Any, Iterator
 
+RAGAS_INSTRUCTIONS = (
+    "Fill 'answer' with your LLM's actual response and 'contexts' with "
+    "retrieved chunks from your RAG pipeline before running RAGAS metrics. "
+    "The '_categories' and '_eval_criteria' fields enable breakdown by test type."
+)
 
-def build_ragas_dataset(suite: dict[str, Any]) -> dict[str, Any]:
+RAGAS_COLUMNS = (
+    "question",
+    "answer",
+    "contexts",
+    "ground_truth",
+    "_categories",
+    "_eval_criteria",
+    "_severity",
+    "_notes",
+)
+
+
+def build_ragas_dataset(suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None) -> dict[str, Any]:
     """Build a RAGAS-compatible dataset from a Crucible test suite.
 
     Output format is compatible with RAGAS evaluation and includes:
@@ -12,49 +30,115 @@ def build_ragas_dataset(suite: dict[str, Any]) -> dict[str, Any]:
 
     The extended fields enable richer analysis in evaluation notebooks,
     allowing breakdown of metrics by test category (happy_path, adversarial, etc.)
-    """
-    questions: list[str] = []
-    answers: list[str] = []
-    contexts: list[list[str]] = []
-    ground_truth: list[str] = []
-
-    # Extended metadata for richer evaluation analysis
-    categories: list[str] = []
-    eval_criteria: list[list[str]] = []
-    severity: list[str] = []
-    notes: list[str] = []
 
-    for case in suite.get("testCases", []):
-        questions.append(case.get("input", ""))
-        answers.append("")  # To be filled by RAG pipeline
-        contexts.append([])  # To be filled by RAG pipeline
-        ground_truth.append(case.get("expectedOutput") or "")
-
-        # Capture test case metadata
-        categories.append(case.get("category", "unknown"))
-        eval_criteria.append(case.get("evalCriteria", []))
-        severity.append(case.get("severity", "medium"))
-        notes.append(case.get("notes") or "")
+    `results` maps case ids to runner output (`output`, `contexts`); matching
+    cases get `answer` and `contexts` filled instead of left empty.
+    """
+    # Columns are pivoted from `iter_ragas_rows` so every Ragas format maps cases the same way.
+    columns: dict[str, list[Any]] = {name: [] for name in RAGAS_COLUMNS}
+    for row in iter_ragas_rows(suite, results):
+        for name in RAGAS_COLUMNS:
+            columns[name].append(row[name])
 
     return {
         # Instructions for users
-        "_instructions": (
-            "Fill 'answer' with your LLM's actual response and 'contexts' with "
-            "retrieved chunks from your RAG pipeline before running RAGAS metrics. "
-            "The '_categories' and '_eval_criteria' fields enable breakdown by test type."
-        ),
-        # Standard RAGAS fields
-        "question": questions,
-        "answer": answers,
-        "contexts": contexts,
-        "ground_truth": ground_truth,
-        # Extended Crucible metadata (prefixed with _ to indicate non-RAGAS fields)
-        "_categories": categories,
-        "_eval_criteria": eval_criteria,
-        "_severity": severity,
-        "_notes": notes,
+        "_instructions": RAGAS_INSTRUCTIONS,
+        # Standard RAGAS fields, then extended Crucible metadata (prefixed with _)
+        **columns,
         # Metadata about the export
         "_app_type": suite.get("appType", "unknown"),
-        "_total_cases": len(questions),
+        "_total_cases": len(columns["question"]),
         "_generated_at": suite.get("generatedAt", ""),
     }
+
+
+def iter_ragas_rows(suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None) -> Iterator[dict[str, Any]]:
+    """Yield one RAGAS row per test case, using the same columns as `build_ragas_dataset`."""
+    for case in suite.get("testCases", []):
+        result = (results or {}).get(case.get("id", ""), {})
+        yield {
+            "question": case.get("input", ""),
+            "answer": result.get("output", ""),  # Filled by the runner or your RAG pipeline
+            "contexts": [str(item) for item in result.get("contexts", [])],
+            "ground_truth": case.get("expectedOutput") or "",
+            "_categories": case.get("category", "unknown"),
+            "_eval_criteria": [str(item) for item in case.get("evalCriteria", [])],
+            "_severity": case.get("severity", "medium"),
+            "_notes": case.get("notes") or "",
+        }
+
+
+def iter_ragas_jsonl(suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None) -> Iterator[str]:
+    """Stream the RAGAS dataset as JSON Lines, one newline-terminated row at a time."""
+    for row in iter_ragas_rows(suite, results):
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def build_ragas_jsonl(suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None) -> str:
+    return "".join(iter_ragas_jsonl(suite, results))
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError("Columnar Ragas exports are disabled: install pyarrow to enable them") from exc
+    return pyarrow
+
+
+def build_ragas_table(suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None) -> Any:
+    """Build a typed `pyarrow.Table` of the RAGAS dataset.
+
+    List-valued columns (`contexts`, `_eval_criteria`) are typed as `list<string>`,
+    and suite-level metadata is stored in the schema metadata rather than as columns.
+    """
+    pa = _require_pyarrow()
+    list_of_strings = pa.list_(pa.string())
+    schema = pa.schema(
+        [
+            pa.field("question", pa.string()),
+            pa.field("answer", pa.string()),
+            pa.field("contexts", list_of_strings),
+            pa.field("ground_truth", pa.string()),
+            pa.field("_categories", pa.string()),
+            pa.field("_eval_criteria", list_of_strings),
+            pa.field("_severity", pa.string()),
+            pa.field("_notes", pa.string()),
+        ],
+        metadata={
+            "_instructions": RAGAS_INSTRUCTIONS,
+            "_app_type": str(suite.get("appType", "unknown")),
+            "_total_cases": str(len(suite.get("testCases", []))),
+            "_generated_at": str(suite.get("generatedAt", "")),
+        },
+    )
+    dataset = build_ragas_dataset(suite, results)
+    return pa.Table.from_pydict({name: dataset[name] for name in RAGAS_COLUMNS}, schema=schema)
+
+
+def build_ragas_parquet(
+    suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None, compression: str = "zstd"
+) -> bytes:
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    sink = pa.BufferOutputStream()
+    pq.write_table(build_ragas_table(suite, results), sink, compression=compression)
+    return sink.getvalue().to_pybytes()
+
+
+def build_ragas_arrow(
+    suite: dict[str, Any], results: dict[str, dict[str, Any]] | None = None, compression: str | None = None
+) -> bytes:
+    """Serialize the dataset as an Arrow IPC file.
+
+    Uncompressed by default so consumers can `pyarrow.memory_map` it without copying;
+    pass `compression="zstd"` or `"lz4"` to trade that for a smaller file.
+    """
+    pa = _require_pyarrow()
+    table = build_ragas_table(suite, results)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
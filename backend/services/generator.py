@@ -1,23 +1,37 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import hashlib
 import json
 import os
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, Literal, cast, get_args
 from uuid import uuid4
 
-from backend.models.schemas import AppDetails, BenchmarkRef, TestCase, TestSuite
-from backend.services.exporters.deepeval import build_deepeval_config
-from backend.services.exporters.promptfoo import build_promptfoo_config
-from backend.services.exporters.ragas import build_ragas_dataset
-from backend.services.providers.anthropic_provider import AnthropicProvider
+from backend.models.schemas import AppDetails, BenchmarkRef, GenerateResponse, ResultFormat, TestCase, TestSuite
+from backend.services.coverage import (
+    ADVERSARIAL_CATEGORIES,
+    ADVERSARIAL_MINIMUM_PERCENT,
+    REQUIRED_CATEGORIES,
+    compute_coverage,
+    plan_top_up,
+)
+from backend.services.exporters.deepeval import build_deepeval_config, build_deepeval_sharded
+from backend.services.exporters.promptfoo import build_promptfoo_config, estimate_grader_calls
+from backend.services.exporters.ragas import (
+    build_ragas_arrow,
+    build_ragas_dataset,
+    build_ragas_jsonl,
+    build_ragas_parquet,
+)
+from backend.services.mutations import mutate_suite
+from backend.services.ollama_readiness import ollama_known_down
 from backend.services.providers.base import BaseLLMProvider
-from backend.services.providers.google_provider import GoogleProvider
-from backend.services.providers.ollama_provider import OllamaProvider
-from backend.services.providers.openai_provider import OpenAIProvider
+from backend.services.selection import select_smoke_subset
+from backend.services.state import get_state_backend
 
 ROOT = Path(__file__).resolve().parents[1]
 PROMPTS_DIR = ROOT / "prompts"
@@ -63,6 +77,10 @@ DEMO_CATEGORIES = [
 
 Mode = Literal["live", "demo-local-ollama", "demo-static"]
 
+JOB_POLL_INTERVAL_SECONDS = 0.25
+GENERATION_ATTEMPTS = 2
+RESULT_FORMATS = set(get_args(ResultFormat))
+
 
 def _load_prompt(name: str) -> str:
     return (PROMPTS_DIR / name).read_text(encoding="utf-8")
@@ -85,13 +103,22 @@ def _extract_json(raw: str) -> str:
 
 
 def _build_provider(name: str) -> BaseLLMProvider:
+    # SDK imports are deferred so the batch CLI only pays for the provider it uses.
     if name == "openai":
+        from backend.services.providers.openai_provider import OpenAIProvider
+
         return OpenAIProvider()
     if name == "anthropic":
+        from backend.services.providers.anthropic_provider import AnthropicProvider
+
         return AnthropicProvider()
     if name == "google":
+        from backend.services.providers.google_provider import GoogleProvider
+
         return GoogleProvider()
     if name == "ollama":
+        from backend.services.providers.ollama_provider import OllamaProvider
+
         return OllamaProvider()
     raise ValueError(f"Unsupported provider: {name}")
 
@@ -107,6 +134,44 @@ def _demo_mode_enabled() -> bool:
     return os.getenv("DEMO_MODE_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
 
 
+def resolve_provider(requested: str) -> str:
+    """Return the provider `generate_suite` will call: unconfigured providers fall back to local Ollama in demo mode."""
+    if _provider_is_configured(requested) or not _demo_mode_enabled():
+        return requested
+    return "ollama"
+
+
+def _response_cache_ttl() -> float:
+    return float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "0"))
+
+
+def _provider_call_timeout() -> float:
+    # Outer bound per provider call; the extra 10s gives httpx a chance to fail first.
+    return float(os.getenv("LOCAL_LLM_TIMEOUT_SECONDS", "120")) + 10
+
+
+def _top_up_rounds() -> int:
+    return int(os.getenv("COVERAGE_TOP_UP_ROUNDS", "1"))
+
+
+def _job_ttl() -> float:
+    """Worst-case duration of one generation: every attempt and top-up round timing out, plus export."""
+    return (GENERATION_ATTEMPTS + _top_up_rounds()) * _provider_call_timeout() + 30
+
+
+def _consume_provider_budget(provider: str) -> None:
+    limit = int(os.getenv("PROVIDER_REQUESTS_PER_MINUTE", "0"))
+    if limit <= 0:
+        return
+    used = get_state_backend().incr_window(f"budget:{provider}", 60)
+    if used > limit:
+        raise RuntimeError(f"{provider} rate limit exceeded: {limit} requests per minute")
+
+
+def _details_key(details: AppDetails) -> str:
+    return hashlib.sha256(details.model_dump_json().encode("utf-8")).hexdigest()
+
+
 def _benchmarks(app_type: str, domain: str) -> list[BenchmarkRef]:
     base = BENCHMARK_MAP.get(app_type, [])
     additions = DOMAIN_ADDITIONS.get(domain.lower(), [])
@@ -125,20 +190,46 @@ def _build_user_prompt(details: AppDetails) -> str:
         "exampleInteractions": examples,
         "requiredCount": details.testCaseCount,
         "requirements": {
-            "adversarialMinimumPercent": 30,
+            "adversarialMinimumPercent": ADVERSARIAL_MINIMUM_PERCENT,
+            "adversarialCategories": ADVERSARIAL_CATEGORIES,
+            "strictJson": True,
+            "categoriesRequired": REQUIRED_CATEGORIES,
+        },
+    }
+    return json.dumps(payload, indent=2)
+
+
+def _build_top_up_prompt(details: AppDetails, plan: dict[str, int]) -> str:
+    payload = {
+        "appType": details.appType,
+        "systemPrompt": details.systemPrompt,
+        "description": details.description,
+        "domain": details.domain,
+        "requiredCount": sum(plan.values()),
+        "requirements": {
             "strictJson": True,
-            "categoriesRequired": [
-                "happy_path",
-                "adversarial",
-                "edge_case",
-                "hallucination_probe",
-                "prompt_injection",
-            ],
+            "categoryCounts": plan,
+            "note": "Top-up request: return only new test cases for exactly these categories and counts.",
         },
     }
     return json.dumps(payload, indent=2)
 
 
+def _accept_top_up_cases(cases: list[TestCase], plan: dict[str, int], existing_ids: set[str]) -> list[TestCase]:
+    remaining = dict(plan)
+    accepted: list[TestCase] = []
+    for case in cases:
+        if remaining.get(case.category, 0) <= 0:
+            continue
+        remaining[case.category] -= 1
+        case_id = case.id
+        if case_id in existing_ids:
+            case_id = f"{case.id}-topup-{len(accepted) + 1}"
+        existing_ids.add(case_id)
+        accepted.append(case.model_copy(update={"id": case_id}))
+    return accepted
+
+
 def _build_demo_suite(details: AppDetails) -> TestSuite:
     cases: list[TestCase] = []
     domain_prefix = f"{details.domain.title()} app"
@@ -172,22 +263,50 @@ def _build_demo_suite(details: AppDetails) -> TestSuite:
     )
 
 
-def _export_content(suite: TestSuite, output_format: str, provider: str) -> tuple[str, str, str, dict[str, Any]]:
+def _export_content(
+    suite: TestSuite,
+    output_format: str,
+    provider: str,
+    variant: str = "",
+    results: dict[str, dict[str, Any]] | None = None,
+    compact: bool = False,
+    shard_size: int = 0,
+) -> tuple[str, str, str, dict[str, Any]]:
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    base = f"crucible_{suite.appType}_{output_format}_{timestamp}"
+    label = f"{output_format}_{variant}" if variant else output_format
+    base = f"crucible_{suite.appType}_{label}_{timestamp}"
+    if output_format == "raw":
+        # Serialized straight from the model by pydantic-core; no intermediate dict.
+        content = suite.model_dump_json(indent=None if compact else 2)
+        return f"{base}.json", "application/json", content, {"format": "raw"}
     as_dict = suite.model_dump()
-    if output_format == "promptfoo":
-        content = build_promptfoo_config(as_dict, provider)
-        return f"{base}.yaml", "application/x-yaml", content, {"format": "promptfoo"}
+    if output_format in {"promptfoo", "promptfoo-optimized"}:
+        content = build_promptfoo_config(as_dict, provider, optimized=output_format == "promptfoo-optimized")
+        framework = {"format": output_format, "graderCalls": estimate_grader_calls(as_dict)}
+        return f"{base}.yaml", "application/x-yaml", content, framework
     if output_format == "deepeval":
-        content = build_deepeval_config(as_dict)
+        content = build_deepeval_config(as_dict, results)
         return f"{base}.py", "text/x-python", content, {"format": "deepeval"}
+    if output_format == "deepeval-sharded":
+        content = base64.b64encode(build_deepeval_sharded(as_dict, shard_size)).decode("ascii")
+        framework = {"format": "deepeval-sharded", "encoding": "base64", "shardSize": shard_size}
+        return f"{base}.zip", "application/zip", content, framework
     if output_format == "ragas":
-        data = build_ragas_dataset(as_dict)
-        content = json.dumps(data, indent=2)
+        data = build_ragas_dataset(as_dict, results)
+        content = json.dumps(data, separators=(",", ":")) if compact else json.dumps(data, indent=2)
         return f"{base}.json", "application/json", content, {"format": "ragas"}
-    content = json.dumps(as_dict, indent=2)
-    return f"{base}.json", "application/json", content, {"format": "raw"}
+    if output_format == "ragas-jsonl":
+        content = build_ragas_jsonl(as_dict, results)
+        return f"{base}.jsonl", "application/x-ndjson", content, {"format": "ragas-jsonl"}
+    if output_format == "ragas-parquet":
+        content = base64.b64encode(build_ragas_parquet(as_dict, results)).decode("ascii")
+        framework = {"format": "ragas-parquet", "encoding": "base64"}
+        return f"{base}.parquet", "application/vnd.apache.parquet", content, framework
+    if output_format == "ragas-arrow":
+        content = base64.b64encode(build_ragas_arrow(as_dict, results)).decode("ascii")
+        framework = {"format": "ragas-arrow", "encoding": "base64"}
+        return f"{base}.arrow", "application/vnd.apache.arrow.file", content, framework
+    raise ValueError(f"Unsupported output format: {output_format}")
 
 
 async def _generate_with_provider(details: AppDetails) -> TestSuite:
@@ -198,17 +317,17 @@ async def _generate_with_provider(details: AppDetails) -> TestSuite:
     provider = _build_provider(details.provider)
     parse_error: Exception | None = None
 
-    provider_timeout = float(os.getenv("LOCAL_LLM_TIMEOUT_SECONDS", "120"))
-    outer_timeout = provider_timeout + 10  # give httpx a chance to fail first
+    outer_timeout = _provider_call_timeout()
 
-    for attempt in range(2):
+    for attempt in range(GENERATION_ATTEMPTS):
+        _consume_provider_budget(details.provider)
         try:
             raw = await asyncio.wait_for(provider.generate(f"{system}\n\n{template}", user), timeout=outer_timeout)
             raw = _extract_json(raw)
             suite = TestSuite.model_validate_json(raw)
             suite.appType = details.appType
             suite.benchmarks = _benchmarks(details.appType, details.domain)
-            return suite
+            break
         except asyncio.TimeoutError as exc:
             raise RuntimeError("Provider timed out while generating test cases") from exc
         except Exception as exc:
@@ -216,11 +335,41 @@ async def _generate_with_provider(details: AppDetails) -> TestSuite:
             if attempt == 0:
                 user = user + "\n\nIMPORTANT: previous output was invalid. Return valid JSON only."
                 continue
-
-    raise RuntimeError(f"LLM output validation failed after retry: {parse_error}")
+    else:
+        raise RuntimeError(f"LLM output validation failed after retry: {parse_error}")
+
+    return await _top_up_coverage(provider, f"{system}\n\n{template}", details, suite, outer_timeout)
+
+
+async def _top_up_coverage(
+    provider: BaseLLMProvider,
+    system: str,
+    details: AppDetails,
+    suite: TestSuite,
+    timeout: float,
+) -> TestSuite:
+    """Ask for just the missing categories instead of regenerating the whole suite.
+
+    Top-up is best effort: any failure keeps the suite as the main call returned it.
+    """
+    for _ in range(_top_up_rounds()):
+        plan = plan_top_up(suite)
+        if not plan:
+            break
+        try:
+            _consume_provider_budget(details.provider)
+            raw = await asyncio.wait_for(provider.generate(system, _build_top_up_prompt(details, plan)), timeout=timeout)
+            extra = TestSuite.model_validate_json(_extract_json(raw)).testCases
+        except Exception:
+            break
+        existing_ids = {case.id for case in suite.testCases}
+        suite.testCases.extend(_accept_top_up_cases(extra, plan, existing_ids))
+    suite.totalCases = len(suite.testCases)
+    return suite
 
 
-async def generate_test_suite(details: AppDetails) -> tuple[TestSuite, str, str, str]:
+async def generate_suite(details: AppDetails) -> TestSuite:
+    """Generate, mutate and score a suite without exporting it or touching the response cache."""
     mode: Mode = "live"
     requested_provider = details.provider
 
@@ -246,13 +395,114 @@ async def generate_test_suite(details: AppDetails) -> tuple[TestSuite, str, str,
             raise RuntimeError(f"{PROVIDER_KEY_MAP[requested_provider]} is not configured and demo mode is disabled")
 
         demo_details = details.model_copy(update={"provider": "ollama"})
-        try:
-            suite = await _generate_with_provider(demo_details)
-            mode = "demo-local-ollama"
-        except Exception:
+        if ollama_known_down():
             suite = _build_demo_suite(details)
             mode = "demo-static"
-
-    filename, mime_type, export_content, framework = _export_content(suite, details.outputFormat, details.provider)
-    suite.frameworkConfig = framework | {"mode": mode}
+        else:
+            try:
+                suite = await _generate_with_provider(demo_details)
+                mode = "demo-local-ollama"
+            except Exception:
+                suite = _build_demo_suite(details)
+                mode = "demo-static"
+
+    mutation_config: dict[str, Any] = {}
+    if details.mutationsPerSeed:
+        suite, stats = mutate_suite(suite, details.mutationsPerSeed, details.mutationSeed)
+        mutation_config = {"mutations": stats}
+
+    suite.frameworkConfig = {"mode": mode, "coverage": compute_coverage(suite)} | mutation_config
+    return suite
+
+
+async def _generate_uncached(details: AppDetails) -> tuple[TestSuite, str, str, str]:
+    suite = await generate_suite(details)
+    filename, mime_type, export_content, framework = _export_content(
+        suite,
+        details.outputFormat,
+        details.provider,
+        compact=details.compactJson,
+        shard_size=details.deepevalShardSize,
+    )
+    suite.frameworkConfig = framework | suite.frameworkConfig
     return suite, filename, mime_type, export_content
+
+
+def build_smoke_export(suite: TestSuite, details: AppDetails) -> tuple[TestSuite, str, str, str] | None:
+    """Select the budgeted smoke subset of `suite` and export it in the requested format."""
+    budget = details.smokeBudget
+    if budget is None:
+        return None
+    subset, stats = select_smoke_subset(
+        suite,
+        max_cases=budget.maxCases,
+        max_tokens=budget.maxTokens,
+        max_seconds=budget.maxSeconds,
+        seed=budget.seed,
+    )
+    filename, mime_type, content, framework = _export_content(
+        subset,
+        details.outputFormat,
+        details.provider,
+        "smoke",
+        compact=details.compactJson,
+        shard_size=details.deepevalShardSize,
+    )
+    subset.frameworkConfig = framework | {"mode": suite.frameworkConfig.get("mode"), "selection": stats}
+    return subset, filename, mime_type, content
+
+
+def build_results_export(
+    suite: TestSuite, output_format: str, results: dict[str, dict[str, Any]]
+) -> tuple[str, str, str, dict[str, Any]]:
+    """Export `suite` with runner output filled into the runtime fields of a Ragas or DeepEval export."""
+    if output_format not in RESULT_FORMATS:
+        raise ValueError(f"Run results can only be exported as {', '.join(sorted(RESULT_FORMATS))}")
+    return _export_content(suite, output_format, "", "results", results)
+
+
+def _load_cached(key: str) -> tuple[TestSuite, str, str, str] | None:
+    cached = get_state_backend().get(f"response:{key}")
+    if cached is None:
+        return None
+    response = GenerateResponse.model_validate_json(cached)
+    return response.suite, response.exportFilename, response.exportMimeType, response.exportContent or ""
+
+
+async def generate_test_suite(details: AppDetails) -> tuple[TestSuite, str, str, str]:
+    """Generate a suite, sharing results and in-flight work across worker processes.
+
+    With `RESPONSE_CACHE_TTL_SECONDS` set, identical requests are served from the
+    state backend, and a request already running in another worker is awaited
+    instead of being sent to the provider a second time.
+    """
+    ttl = _response_cache_ttl()
+    if ttl <= 0:
+        return await _generate_uncached(details)
+
+    state = get_state_backend()
+    key = _details_key(details)
+    job_key = f"job:{key}"
+    job_ttl = _job_ttl()
+
+    while True:
+        cached = _load_cached(key)
+        if cached is not None:
+            return cached
+        if state.add(job_key, b"running", job_ttl):
+            break
+        while state.get(job_key) is not None:
+            await asyncio.sleep(JOB_POLL_INTERVAL_SECONDS)
+
+    try:
+        suite, filename, mime_type, content = await _generate_uncached(details)
+        response = GenerateResponse.model_construct(
+            suite=suite,
+            exportFilename=filename,
+            exportMimeType=mime_type,
+            exportContent=content,
+        )
+        state.set(f"response:{key}", response.model_dump_json().encode("utf-8"), ttl)
+        return suite, filename, mime_type, content
+    finally:
+        state.delete(job_key)
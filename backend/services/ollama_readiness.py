@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+from backend.services.state import get_state_backend
+
+logger = logging.getLogger(__name__)
+
+READINESS_KEY = "ollama:ready"
+WARMUP_LOCK_KEY = "ollama:warmup"
+
+
+def _interval() -> float:
+    return float(os.getenv("OLLAMA_WARMUP_INTERVAL_SECONDS", "240"))
+
+
+TRUTHY = {"1", "true", "yes", "on"}
+CLOUD_KEY_VARS = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY")
+
+
+def _ollama_in_use() -> bool:
+    """True when requests can reach Ollama: it is the default provider, or demo mode has no cloud key to use."""
+    if os.getenv("DEFAULT_PROVIDER", "").strip().lower() == "ollama":
+        return True
+    demo_mode = os.getenv("DEMO_MODE_ENABLED", "true").strip().lower() in TRUTHY
+    return demo_mode and not any(os.getenv(name, "").strip() for name in CLOUD_KEY_VARS)
+
+
+def warmup_enabled() -> bool:
+    """`OLLAMA_WARMUP_ENABLED` when set; otherwise warm up only if Ollama will actually be used."""
+    value = os.getenv("OLLAMA_WARMUP_ENABLED", "").strip().lower()
+    if value:
+        return value in TRUTHY
+    return _ollama_in_use()
+
+
+def record_ollama_readiness(ready: bool) -> None:
+    ttl = float(os.getenv("OLLAMA_READINESS_TTL_SECONDS", "0")) or max(_interval() * 2, 60)
+    get_state_backend().set(READINESS_KEY, b"1" if ready else b"0", ttl)
+
+
+def ollama_known_down() -> bool:
+    """True only when a recent check found Ollama unavailable; unknown counts as not down."""
+    return get_state_backend().get(READINESS_KEY) == b"0"
+
+
+async def warm_up_ollama() -> bool:
+    from backend.services.providers.ollama_provider import OllamaProvider
+
+    provider = OllamaProvider()
+    ready = await provider.warm_up()
+    record_ollama_readiness(ready)
+    if ready:
+        logger.info("Ollama model '%s' is loaded (keep_alive=%s)", provider.model, provider.keep_alive)
+    else:
+        logger.info("Ollama model '%s' is not available at %s", provider.model, provider.base_url)
+    return ready
+
+
+async def run_warmup_loop() -> None:
+    """Warm up at startup and then periodically; with several workers only one warms per interval."""
+    interval = _interval()
+    while True:
+        if get_state_backend().add(WARMUP_LOCK_KEY, b"1", max(interval * 0.9, 30)):
+            try:
+                await warm_up_ollama()
+            except Exception:
+                logger.exception("Ollama warm-up failed")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
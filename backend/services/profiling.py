@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+PROFILE_HEADER = "X-Crucible-Profile"
+PROFILE_ID_HEADER = "X-Crucible-Profile-Id"
+PROFILE_SUFFIX = ".speedscope.json"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+TRUTHY = {"1", "true", "yes", "on"}
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("PROFILING_ENABLED", "false").strip().lower() in TRUTHY
+
+
+def profile_requested(headers: Any, query: Any) -> bool:
+    """True when the server allows profiling and the request opted in via header or `?profile=`."""
+    if not profiling_enabled():
+        return False
+    flag = headers.get(PROFILE_HEADER) or query.get("profile") or ""
+    return flag.strip().lower() in TRUTHY
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack from a background thread.
+
+    Sampling the event-loop thread keeps overhead bounded by the interval rather than
+    by call count, and also works across `await` points. Stacks of other requests
+    served concurrently on the same loop will appear in the profile too.
+    """
+
+    def __init__(self, interval_seconds: float, thread_id: int | None = None) -> None:
+        self.interval = interval_seconds
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self._frames: list[dict[str, Any]] = []
+        self._frame_index: dict[tuple[str, str, int], int] = {}
+        self._samples: list[list[int]] = []
+        self._weights: list[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="crucible-profiler", daemon=True)
+        self._started_at = 0.0
+        self._elapsed = 0.0
+
+    def _stack(self, frame: Any) -> list[int]:
+        stack: list[int] = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_name, code.co_filename, code.co_firstlineno)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = len(self._frames)
+                self._frame_index[key] = index
+                self._frames.append({"name": key[0], "file": key[1], "line": key[2]})
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._samples.append(self._stack(frame))
+                self._weights.append(now - last)
+            last = now
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._elapsed = time.perf_counter() - self._started_at
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "crucible-eval",
+            "shared": {"frames": self._frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self._elapsed,
+                    "samples": self._samples,
+                    "weights": self._weights,
+                }
+            ],
+        }
+
+
+class ProfileStore:
+    """Directory of speedscope profiles with count- and age-bounded retention."""
+
+    def __init__(self, directory: str | Path, max_count: int, max_age_seconds: float) -> None:
+        self.directory = Path(directory)
+        self.max_count = max_count
+        self.max_age_seconds = max_age_seconds
+
+    def save(self, profile: dict[str, Any]) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = uuid4().hex
+        target = self.directory / f"{profile_id}{PROFILE_SUFFIX}"
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(profile, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(target)
+        self.prune()
+        return profile_id
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        entries = self.directory.glob(f"*{PROFILE_SUFFIX}")
+        return sorted(entries, key=lambda path: path.stat().st_mtime, reverse=True)
+
+    def prune(self) -> None:
+        cutoff = time.time() - self.max_age_seconds
+        for index, path in enumerate(self._entries()):
+            if index >= self.max_count or path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+
+    def list(self) -> list[dict[str, Any]]:
+        self.prune()
+        return [
+            {
+                "id": path.name.removesuffix(PROFILE_SUFFIX),
+                "createdAt": path.stat().st_mtime,
+                "sizeBytes": path.stat().st_size,
+            }
+            for path in self._entries()
+        ]
+
+    def path_for(self, profile_id: str) -> Path | None:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}{PROFILE_SUFFIX}"
+        return path if path.is_file() else None
+
+
+def get_profile_store() -> ProfileStore:
+    directory = os.getenv("PROFILE_DIR", "").strip() or str(Path(tempfile.gettempdir()) / "crucible-profiles")
+    return ProfileStore(
+        directory,
+        max_count=int(os.getenv("PROFILE_MAX_COUNT", "50")),
+        max_age_seconds=float(os.getenv("PROFILE_MAX_AGE_SECONDS", "86400")),
+    )
+
+
+@asynccontextmanager
+async def capture_profile(name: str) -> AsyncIterator[dict[str, str]]:
+    """Profile the enclosed block and store the result; the yielded dict receives its `id`.
+
+    The profile is saved even when the block raises, and the file write runs in a thread.
+    """
+    interval = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1")) / 1000
+    profiler = SamplingProfiler(interval)
+    result: dict[str, str] = {}
+    profiler.start()
+    try:
+        yield result
+    finally:
+        profiler.stop()
+        result["id"] = await asyncio.to_thread(get_profile_store().save, profiler.to_speedscope(name))
@@ -1,28 +1,53 @@
 from __future__ import annotations
 
 import os
+from typing import Any
 
 import httpx
 
 from .base import BaseLLMProvider
 
+OPTION_ENV_VARS = {
+    "num_ctx": "OLLAMA_NUM_CTX",
+    "num_predict": "OLLAMA_NUM_PREDICT",
+    "num_thread": "OLLAMA_NUM_THREAD",
+}
+
+
+def _keep_alive(value: str) -> str | int:
+    # Ollama takes durations ("30m") or plain seconds; -1 pins the model indefinitely.
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
 
 class OllamaProvider(BaseLLMProvider):
     def __init__(self) -> None:
         self.base_url = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434").rstrip("/")
         self.model = self.resolve_model("deepseek-r1", "OLLAMA_MODEL_NAME")
         self.timeout = float(os.getenv("LOCAL_LLM_TIMEOUT_SECONDS", "120"))
+        self.health_timeout = float(os.getenv("OLLAMA_HEALTH_TIMEOUT_SECONDS", "2"))
+        self.keep_alive = _keep_alive(os.getenv("OLLAMA_KEEP_ALIVE", "30m").strip() or "30m")
+        self.options: dict[str, Any] = {
+            option: int(os.environ[env_var])
+            for option, env_var in OPTION_ENV_VARS.items()
+            if os.getenv(env_var, "").strip()
+        }
 
     async def generate(self, system: str, user: str) -> str:
-        payload = {
+        payload: dict[str, Any] = {
             "model": self.model,
             "stream": False,
             "format": "json",
+            "keep_alive": self.keep_alive,
             "messages": [
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
             ],
         }
+        if self.options:
+            payload["options"] = self.options
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 response = await client.post(f"{self.base_url}/api/chat", json=payload)
@@ -41,3 +66,30 @@ class OllamaProvider(BaseLLMProvider):
             raise RuntimeError(f"Ollama provider request failed: {exc}") from exc
         except Exception as exc:
             raise RuntimeError(f"Ollama provider request failed: {exc}") from exc
+
+    async def is_available(self) -> bool:
+        """Check `/api/tags` for the configured model without loading it."""
+        try:
+            async with httpx.AsyncClient(timeout=self.health_timeout) as client:
+                response = await client.get(f"{self.base_url}/api/tags")
+                response.raise_for_status()
+                models = response.json().get("models", [])
+        except Exception:
+            return False
+        names = {str(item.get("name", "")) for item in models if isinstance(item, dict)}
+        return self.model in names or f"{self.model}:latest" in names
+
+    async def warm_up(self) -> bool:
+        """Load the model into memory and pin it for `keep_alive`; returns readiness."""
+        if not await self.is_available():
+            return False
+        payload: dict[str, Any] = {"model": self.model, "prompt": "", "keep_alive": self.keep_alive}
+        if self.options:
+            payload["options"] = self.options
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.post(f"{self.base_url}/api/generate", json=payload)
+                response.raise_for_status()
+        except Exception:
+            return False
+        return True
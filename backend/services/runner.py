@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import inspect
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from backend.models.schemas import TestCase, TestSuite
+
+# HTTP statuses worth retrying; any other 4xx means the request itself is wrong.
+RETRYABLE_STATUSES = {408, 425, 429}
+
+
+class TargetError(Exception):
+    def __init__(self, message: str, retryable: bool = True) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+@dataclass
+class CaseResult:
+    id: str
+    status: str  # "ok" or "failed"
+    output: str = ""
+    contexts: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+    attempts: int = 0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class RunReport:
+    results: list[CaseResult]
+    wall_seconds: float
+
+    def results_by_id(self) -> dict[str, dict[str, Any]]:
+        """Successful results keyed by case id, in the shape the exporters accept."""
+        return {r.id: {"output": r.output, "contexts": r.contexts} for r in self.results if r.status == "ok"}
+
+    def summary(self) -> dict[str, Any]:
+        succeeded = [r for r in self.results if r.status == "ok"]
+        latencies = [r.seconds for r in succeeded]
+        summary: dict[str, Any] = {
+            "total": len(self.results),
+            "succeeded": len(succeeded),
+            "failed": len(self.results) - len(succeeded),
+            "retried": sum(1 for r in self.results if r.attempts > 1),
+            "wallSeconds": round(self.wall_seconds, 3),
+            "casesPerSecond": round(len(self.results) / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+        }
+        if latencies:
+            summary["latency"] = {
+                "mean": round(statistics.fmean(latencies), 3),
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "max": round(max(latencies), 3),
+            }
+        return summary
+
+
+def build_report(suite: TestSuite, results: list[CaseResult], wall_seconds: float) -> RunReport:
+    """Put results collected in completion order back into suite order."""
+    position = {case.id: index for index, case in enumerate(suite.testCases)}
+    return RunReport(results=sorted(results, key=lambda result: position[result.id]), wall_seconds=wall_seconds)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _normalize_reply(value: Any, output_field: str = "output", contexts_field: str = "contexts") -> tuple[str, list[str]]:
+    if isinstance(value, str):
+        return value, []
+    if isinstance(value, dict):
+        contexts = value.get(contexts_field, value.get("retrieval_context")) or []
+        if isinstance(contexts, str):
+            contexts = [contexts]
+        return str(value.get(output_field, "")), [str(item) for item in contexts]
+    return str(value), []
+
+
+class HttpTarget:
+    """POSTs `{inputField: case.input}` to `url` and reads the output (and contexts) from the JSON reply.
+
+    A non-JSON reply is used as the output verbatim. Use as an async context manager
+    so one connection pool is shared by every case.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        input_field: str = "input",
+        output_field: str = "output",
+        contexts_field: str = "contexts",
+        max_connections: int = 64,
+    ) -> None:
+        self.url = url
+        self.input_field = input_field
+        self.output_field = output_field
+        self.contexts_field = contexts_field
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=None,  # the runner enforces per-case timeouts
+        )
+
+    async def __aenter__(self) -> HttpTarget:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._client.aclose()
+
+    async def __call__(self, text: str) -> tuple[str, list[str]]:
+        try:
+            response = await self._client.post(self.url, json={self.input_field: text})
+        except httpx.HTTPError as exc:
+            raise TargetError(f"{type(exc).__name__}: {exc}") from exc
+        if response.status_code >= 400:
+            retryable = response.status_code >= 500 or response.status_code in RETRYABLE_STATUSES
+            raise TargetError(f"HTTP {response.status_code} from target", retryable=retryable)
+        try:
+            body = response.json()
+        except ValueError:
+            return response.text, []
+        return _normalize_reply(body, self.output_field, self.contexts_field)
+
+
+class CallableTarget:
+    """Wraps a sync or async callable returning a string or `{"output": ..., "contexts": [...]}`.
+
+    Sync callables run in the default thread pool so they do not block other cases.
+    """
+
+    def __init__(self, func: Callable[[str], Any]) -> None:
+        self.func = func
+
+    async def __aenter__(self) -> CallableTarget:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+    async def __call__(self, text: str) -> tuple[str, list[str]]:
+        if inspect.iscoroutinefunction(self.func):
+            value = await self.func(text)
+        else:
+            value = await asyncio.to_thread(self.func, text)
+            if inspect.isawaitable(value):
+                value = await value
+        return _normalize_reply(value)
+
+
+def load_callable_target(spec: str) -> CallableTarget:
+    """Resolve a `package.module:function` spec, the same convention as `CRUCIBLE_TARGET`."""
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Target callable must look like 'package.module:function', got {spec!r}")
+    func = getattr(importlib.import_module(module_name), attr)
+    return CallableTarget(func)
+
+
+Target = Callable[[str], Awaitable[tuple[str, list[str]]]]
+
+
+async def _run_case(
+    case: TestCase,
+    target: Target,
+    limit: asyncio.Semaphore,
+    timeout_seconds: float,
+    retries: int,
+    backoff_seconds: float,
+) -> CaseResult:
+    async with limit:
+        error = ""
+        for attempt in range(1, retries + 2):
+            started = time.perf_counter()
+            try:
+                output, contexts = await asyncio.wait_for(target(case.input), timeout=timeout_seconds)
+                return CaseResult(
+                    id=case.id,
+                    status="ok",
+                    output=output,
+                    contexts=contexts,
+                    seconds=time.perf_counter() - started,
+                    attempts=attempt,
+                )
+            except asyncio.TimeoutError:
+                error = f"timed out after {timeout_seconds:g}s"
+            except TargetError as exc:
+                error = str(exc)
+                if not exc.retryable:
+                    return CaseResult(id=case.id, status="failed", attempts=attempt, error=error)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            if attempt <= retries:
+                await asyncio.sleep(backoff_seconds * 2 ** (attempt - 1))
+        return CaseResult(id=case.id, status="failed", attempts=retries + 1, error=error)
+
+
+async def iter_run(
+    suite: TestSuite,
+    target: Target,
+    concurrency: int = 8,
+    timeout_seconds: float = 30,
+    retries: int = 2,
+    backoff_seconds: float = 0.5,
+) -> AsyncIterator[CaseResult]:
+    """Call `target` for every case with at most `concurrency` in flight, yielding results as they finish.
+
+    Each attempt is bounded by `timeout_seconds`; failed attempts are retried with
+    exponential backoff. Closing the iterator early cancels the outstanding cases.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.create_task(_run_case(case, target, limit, timeout_seconds, retries, backoff_seconds))
+        for case in suite.testCases
+    ]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_suite(
+    suite: TestSuite,
+    target: Target,
+    concurrency: int = 8,
+    timeout_seconds: float = 30,
+    retries: int = 2,
+    backoff_seconds: float = 0.5,
+    on_result: Callable[[CaseResult, int, int], None] | None = None,
+) -> RunReport:
+    """Run every case and return results in suite order; `on_result(result, done, total)` reports progress."""
+    started = time.perf_counter()
+    results: list[CaseResult] = []
+    async for result in iter_run(suite, target, concurrency, timeout_seconds, retries, backoff_seconds):
+        results.append(result)
+        if on_result is not None:
+            on_result(result, len(results), len(suite.testCases))
+    return build_report(suite, results, time.perf_counter() - started)
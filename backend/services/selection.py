@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import random
+import re
+from collections import deque
+from itertools import islice
+from typing import Any
+
+from backend.models.schemas import TestCase, TestSuite
+
+SEVERITY_ORDER = ["critical", "high", "medium", "low"]
+CHARS_PER_TOKEN = 4
+SECONDS_PER_CASE = 2.0
+SECONDS_PER_TOKEN = 0.02
+# Candidates scored for diversity per pick; keeps selection linear in suite size.
+CANDIDATE_WINDOW = 32
+
+_WORD = re.compile(r"\w+")
+
+
+def estimate_case_tokens(case: TestCase) -> int:
+    return (len(case.input) + len(case.expectedOutput or "")) // CHARS_PER_TOKEN + 1
+
+
+def estimate_case_seconds(case: TestCase) -> float:
+    return SECONDS_PER_CASE + estimate_case_tokens(case) * SECONDS_PER_TOKEN
+
+
+class _Budget:
+    def __init__(self, max_cases: int | None, max_tokens: int | None, max_seconds: float | None) -> None:
+        self.max_cases = max_cases
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.cases = 0
+        self.tokens = 0
+        self.seconds = 0.0
+
+    def exhausted(self) -> bool:
+        return self.max_cases is not None and self.cases >= self.max_cases
+
+    def fits(self, tokens: int, seconds: float) -> bool:
+        if self.max_cases is not None and self.cases + 1 > self.max_cases:
+            return False
+        if self.max_tokens is not None and self.tokens + tokens > self.max_tokens:
+            return False
+        return self.max_seconds is None or self.seconds + seconds <= self.max_seconds
+
+    def take(self, tokens: int, seconds: float) -> None:
+        self.cases += 1
+        self.tokens += tokens
+        self.seconds += seconds
+
+
+def select_smoke_subset(
+    suite: TestSuite,
+    max_cases: int | None = None,
+    max_tokens: int | None = None,
+    max_seconds: float | None = None,
+    seed: int = 0,
+) -> tuple[TestSuite, dict[str, Any]]:
+    """Pick a budget-bounded subset that covers as many category/severity cells as possible.
+
+    Cells are visited from `critical` down to `low`. The first pass takes one case per
+    cell; later passes round-robin over categories within each severity. Within a cell,
+    the candidate sharing the fewest words with already-selected inputs wins. The same
+    seed always yields the same subset.
+    """
+    if max_cases is None and max_tokens is None and max_seconds is None:
+        raise ValueError("Smoke selection needs at least one of max_cases, max_tokens or max_seconds")
+
+    rng = random.Random(seed)
+    order = list(range(len(suite.testCases)))
+    rng.shuffle(order)
+
+    buckets: dict[str, dict[str, deque[int]]] = {severity: {} for severity in SEVERITY_ORDER}
+    for index in order:
+        case = suite.testCases[index]
+        buckets[case.severity].setdefault(case.category, deque()).append(index)
+    category_order = {severity: sorted(cells) for severity, cells in buckets.items()}
+    for categories in category_order.values():
+        rng.shuffle(categories)
+
+    tokens = [estimate_case_tokens(case) for case in suite.testCases]
+    seconds = [estimate_case_seconds(case) for case in suite.testCases]
+    words: dict[int, set[str]] = {}
+    seen: set[str] = set()
+    budget = _Budget(max_cases, max_tokens, max_seconds)
+    selected: list[int] = []
+
+    def pick(cell: deque[int]) -> bool:
+        while cell and not budget.exhausted():
+            best, best_novelty = cell[0], -1.0
+            for index in islice(cell, CANDIDATE_WINDOW):
+                if index not in words:
+                    words[index] = set(_WORD.findall(suite.testCases[index].input.lower()))
+                novelty = len(words[index] - seen) / (len(words[index]) or 1)
+                if novelty > best_novelty:
+                    best, best_novelty = index, novelty
+            cell.remove(best)
+            if budget.fits(tokens[best], seconds[best]):
+                budget.take(tokens[best], seconds[best])
+                selected.append(best)
+                seen.update(words[best])
+                return True
+        return False
+
+    for severity in SEVERITY_ORDER:
+        for category in category_order[severity]:
+            pick(buckets[severity][category])
+
+    for severity in SEVERITY_ORDER:
+        active = [buckets[severity][category] for category in category_order[severity]]
+        while active and not budget.exhausted():
+            active = [cell for cell in active if pick(cell) and cell]
+
+    chosen = sorted(selected)
+    subset = TestSuite(
+        appType=suite.appType,
+        generatedAt=suite.generatedAt,
+        testCases=[suite.testCases[index] for index in chosen],
+        benchmarks=suite.benchmarks,
+    )
+    stats = {
+        "seed": seed,
+        "selectedCases": len(chosen),
+        "totalCases": len(suite.testCases),
+        "estimatedTokens": budget.tokens,
+        "estimatedSeconds": round(budget.seconds, 2),
+        "cellsCovered": len({(case.severity, case.category) for case in subset.testCases}),
+        "cellsTotal": len({(case.severity, case.category) for case in suite.testCases}),
+        "budget": {"maxCases": max_cases, "maxTokens": max_tokens, "maxSeconds": max_seconds},
+    }
+    return subset, stats
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import heapq
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+class StateBackend:
+    """Key/value store shared by every worker process serving the API.
+
+    Holds the response cache, provider request budgets and in-flight job markers.
+    Values are raw bytes; a `ttl_seconds` of None means the key never expires.
+    """
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl_seconds: float | None = None) -> bool:
+        """Set `key` only if it is absent; return whether this caller won."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr_window(self, key: str, window_seconds: float) -> int:
+        """Increment a fixed-window counter and return its value for the current window."""
+        raise NotImplementedError
+
+
+class MemoryStateBackend(StateBackend):
+    """Process-local backend; the default when running a single worker.
+
+    Expired keys are dropped on every write, and once values exceed `max_bytes`
+    the least recently used keys are evicted.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._expiries: list[tuple[float, str]] = []
+        self._bytes = 0
+
+    def _drop(self, key: str) -> None:
+        value, _ = self._items.pop(key)
+        self._bytes -= len(value)
+
+    def _put(self, key: str, value: bytes, expires_at: float | None, now: float) -> None:
+        if key in self._items:
+            self._drop(key)
+        self._items[key] = (value, expires_at)
+        self._bytes += len(value)
+        if expires_at is not None:
+            heapq.heappush(self._expiries, (expires_at, key))
+        # Heap entries can be stale after an overwrite, so only drop keys whose current expiry has passed.
+        while self._expiries and self._expiries[0][0] <= now:
+            _, expired = heapq.heappop(self._expiries)
+            item = self._items.get(expired)
+            if item is not None and item[1] is not None and item[1] <= now:
+                self._drop(expired)
+        while self._bytes > self.max_bytes and len(self._items) > 1:
+            self._drop(next(iter(self._items)))
+
+    def _live(self, key: str, now: float) -> bytes | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= now:
+            self._drop(key)
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._live(key, time.time())
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._put(key, value, now + ttl_seconds if ttl_seconds else None, now)
+
+    def add(self, key: str, value: bytes, ttl_seconds: float | None = None) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._live(key, now) is not None:
+                return False
+            self._put(key, value, now + ttl_seconds if ttl_seconds else None, now)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._items:
+                self._drop(key)
+
+    def incr_window(self, key: str, window_seconds: float) -> int:
+        now = time.time()
+        window_key = f"{key}:{int(now // window_seconds)}"
+        with self._lock:
+            current = self._live(window_key, now)
+            count = int(current or b"0") + 1
+            self._put(window_key, str(count).encode(), now + window_seconds, now)
+            return count
+
+
+class SQLiteStateBackend(StateBackend):
+    """Backend shared between local worker processes through a WAL-mode SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS kv_expires_at ON kv (expires_at)")
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def add(self, key: str, value: bytes, ttl_seconds: float | None = None) -> bool:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, now))
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, now + ttl_seconds if ttl_seconds else None),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def incr_window(self, key: str, window_seconds: float) -> int:
+        now = time.time()
+        window_key = f"{key}:{int(now // window_seconds)}"
+        with self._lock:
+            row = self._conn.execute(
+                "INSERT INTO kv (key, value, expires_at) VALUES (?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1 RETURNING value",
+                (window_key, now + window_seconds),
+            ).fetchone()
+        return int(row[0])
+
+
+class RedisStateBackend(StateBackend):
+    """Optional drop-in for multi-host deployments; requires the `redis` package."""
+
+    def __init__(self, url: str) -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("STATE_BACKEND=redis is not configured: install the redis package") from exc
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        self.client.set(key, value, px=int(ttl_seconds * 1000) if ttl_seconds else None)
+
+    def add(self, key: str, value: bytes, ttl_seconds: float | None = None) -> bool:
+        return bool(self.client.set(key, value, nx=True, px=int(ttl_seconds * 1000) if ttl_seconds else None))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def incr_window(self, key: str, window_seconds: float) -> int:
+        window_key = f"{key}:{int(time.time() // window_seconds)}"
+        pipeline = self.client.pipeline()
+        pipeline.incr(window_key)
+        pipeline.expire(window_key, int(window_seconds) + 1)
+        count, _ = pipeline.execute()
+        return int(count)
+
+
+_backend: StateBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def _default_sqlite_path() -> str:
+    return str(Path(tempfile.gettempdir()) / "crucible-state.sqlite3")
+
+
+def build_state_backend(name: str) -> StateBackend:
+    if name == "memory":
+        return MemoryStateBackend(int(os.getenv("STATE_MEMORY_MAX_MB", "256")) * 1024 * 1024)
+    if name == "sqlite":
+        return SQLiteStateBackend(os.getenv("STATE_SQLITE_PATH", "").strip() or _default_sqlite_path())
+    if name == "redis":
+        return RedisStateBackend(os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"))
+    raise ValueError(f"Unsupported state backend: {name}")
+
+
+def get_state_backend() -> StateBackend:
+    """Return this process's backend, created on first use from `STATE_BACKEND`."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = os.getenv("STATE_BACKEND", "memory").strip().lower()
+                _backend = build_state_backend(name)
+    return _backend
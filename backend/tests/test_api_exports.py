@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gzip
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.export_store import negotiate_encoding, store_export
+from backend.services.state import MemoryStateBackend
+
+PAYLOAD = {
+    "appType": "rag",
+    "systemPrompt": "You answer only from approved docs.",
+    "description": "Policy QA assistant",
+    "domain": "e-commerce",
+    "provider": "openai",
+    "testCaseCount": 10,
+    "outputFormat": "promptfoo",
+    "exampleInteractions": [],
+}
+DEMO_ENV = {"DEMO_MODE_ENABLED": "true", "OPENAI_API_KEY": "", "OLLAMA_BASE_URL": "http://127.0.0.1:9"}
+
+
+class ExportsApiTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = TestClient(app)
+        state = patch("backend.services.export_store.get_state_backend", return_value=MemoryStateBackend())
+        state.start()
+        self.addCleanup(state.stop)
+
+    def _generate(self, **params: str) -> dict:
+        with patch.dict("os.environ", DEMO_ENV, clear=False):
+            response = self.client.post("/generate", json=PAYLOAD, params=params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_reference_mode_omits_inline_content(self) -> None:
+        body = self._generate(exportInline="false")
+        self.assertIsNone(body["exportContent"])
+        self.assertEqual(body["exportUrl"], f"/exports/{body['exportRef']}")
+
+        download = self.client.get(body["exportUrl"], headers={"Accept-Encoding": "identity"})
+        self.assertEqual(download.status_code, 200)
+        self.assertIn("providers:", download.text)
+        self.assertEqual(download.headers["etag"], f'"{body["exportRef"]}"')
+
+    def test_gzip_negotiation_and_conditional_get(self) -> None:
+        body = self._generate()
+        url = body["exportUrl"]
+
+        compressed = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(compressed.headers["content-encoding"], "gzip")
+        self.assertEqual(compressed.text, body["exportContent"])
+        self.assertLess(int(compressed.headers["content-length"]), len(body["exportContent"].encode()))
+
+        cached = self.client.get(url, headers={"If-None-Match": compressed.headers["etag"]})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+
+    def test_evicted_body_is_restored_by_storing_again(self) -> None:
+        state = MemoryStateBackend(max_bytes=300_000)
+        content = "".join(f"case {i}: {i * 7919 % 104729}\n" for i in range(5_000))
+        with patch("backend.services.export_store.get_state_backend", return_value=state):
+            digest = store_export(content, "utf-8", "suite.json", "application/json")
+            url = f"/exports/{digest}"
+            self.assertEqual(self.client.get(url, headers={"If-None-Match": f'"{digest}"'}).status_code, 304)
+            state.set("filler", b"x" * 250_000)
+            self.assertIsNotNone(state.get(f"export:{digest}:meta"))
+            self.assertIsNone(state.get(f"export:{digest}:identity"))
+
+            self.assertEqual(self.client.get(url, headers={"Accept-Encoding": "identity"}).status_code, 404)
+            self.assertIsNone(state.get(f"export:{digest}:meta"))
+
+            self.assertEqual(store_export(content, "utf-8", "suite.json", "application/json"), digest)
+            state.delete(f"export:{digest}:identity")
+            self.assertEqual(store_export(content, "utf-8", "suite.json", "application/json"), digest)
+            download = self.client.get(url, headers={"Accept-Encoding": "identity"})
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download.text, content)
+
+    def test_unknown_export_returns_404(self) -> None:
+        self.assertEqual(self.client.get("/exports/" + "0" * 64).status_code, 404)
+        self.assertEqual(self.client.get("/exports/not-a-digest").status_code, 404)
+
+
+class NegotiateEncodingTest(unittest.TestCase):
+    def test_respects_quality_values(self) -> None:
+        available = ["gzip", "br", "zstd"]
+        self.assertEqual(negotiate_encoding("gzip, br;q=0.5", available), "gzip")
+        self.assertEqual(negotiate_encoding("gzip;q=0, identity", available), "identity")
+        self.assertEqual(negotiate_encoding("*", ["gzip"]), "gzip")
+        self.assertEqual(negotiate_encoding("", available), "identity")
+
+    def test_prefers_zstd_when_equally_acceptable(self) -> None:
+        self.assertEqual(negotiate_encoding("gzip, br, zstd", ["gzip", "br", "zstd"]), "zstd")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import json
 import unittest
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
 from backend.main import app
+from backend.models.schemas import GenerateResponse, TestSuite
 
 
 class GenerateApiTest(unittest.TestCase):
@@ -43,6 +45,54 @@ class GenerateApiTest(unittest.TestCase):
         self.assertEqual(suite["totalCases"], 10)
         self.assertIn(suite["frameworkConfig"]["mode"], ["demo-static", "demo-local-ollama"])
 
+    def test_raw_export_is_pre_rendered_and_optionally_compact(self) -> None:
+        payload = {
+            "appType": "rag",
+            "systemPrompt": "You answer only from approved docs.",
+            "description": "Policy QA assistant",
+            "domain": "e-commerce",
+            "provider": "openai",
+            "testCaseCount": 10,
+            "outputFormat": "raw",
+            "smokeBudget": {"maxCases": 3},
+        }
+
+        env = {"DEMO_MODE_ENABLED": "true", "OPENAI_API_KEY": "", "OLLAMA_BASE_URL": "http://127.0.0.1:9"}
+        with patch.dict("os.environ", env, clear=False):
+            pretty = self.client.post("/generate", json=payload)
+            compact = self.client.post("/generate", json=payload | {"compactJson": True})
+
+        self.assertEqual(pretty.headers["content-type"], "application/json")
+        for response in (pretty, compact):
+            self.assertEqual(response.status_code, 200)
+            body = GenerateResponse.model_validate_json(response.content)
+            self.assertEqual(TestSuite.model_validate_json(body.exportContent or "").totalCases, 10)
+            self.assertIsNotNone(body.smoke)
+        self.assertIn("\n  ", pretty.json()["exportContent"])
+        self.assertNotIn("\n", compact.json()["exportContent"])
+        self.assertNotIn("\n", compact.json()["smoke"]["exportContent"])
+
+    def test_ragas_jsonl_streams_one_row_per_case(self) -> None:
+        payload = {
+            "appType": "rag",
+            "systemPrompt": "You answer only from approved docs.",
+            "description": "Policy QA assistant",
+            "domain": "e-commerce",
+            "provider": "openai",
+            "testCaseCount": 10,
+        }
+
+        env = {"DEMO_MODE_ENABLED": "true", "OPENAI_API_KEY": "", "OLLAMA_BASE_URL": "http://127.0.0.1:9"}
+        with patch.dict("os.environ", env, clear=False):
+            with self.client.stream("POST", "/generate/ragas.jsonl", json=payload) as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+                rows = [json.loads(line) for line in response.iter_lines() if line]
+
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[0]["answer"], "")
+        self.assertIn("_categories", rows[0])
+
     def test_generate_returns_503_when_demo_disabled_and_no_key(self) -> None:
         payload = {
             "appType": "rag",
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.cli import MANIFEST_NAME, main
+from backend.models.schemas import AppDetails, TestSuite
+
+DEMO_ENV = {
+    "DEMO_MODE_ENABLED": "true",
+    "OPENAI_API_KEY": "",
+    "ANTHROPIC_API_KEY": "",
+    "GOOGLE_API_KEY": "",
+    "OLLAMA_BASE_URL": "http://127.0.0.1:9",
+}
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.in_dir = self.root / "configs"
+        self.out_dir = self.root / "out"
+        self.in_dir.mkdir()
+        (self.in_dir / "support.yaml").write_text(
+            "appType: rag\n"
+            "systemPrompt: You answer only from approved docs.\n"
+            "description: Policy QA assistant\n"
+            "domain: e-commerce\n"
+            "provider: openai\n"
+            "testCaseCount: 10\n"
+            "outputFormat: promptfoo\n",
+            encoding="utf-8",
+        )
+        (self.in_dir / "chat.json").write_text(
+            json.dumps(
+                {
+                    "appType": "chatbot",
+                    "systemPrompt": "You are a safe assistant.",
+                    "description": "General Q&A chatbot.",
+                    "domain": "healthcare",
+                    "provider": "anthropic",
+                    "testCaseCount": 10,
+                    "outputFormat": "raw",
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    def _run(self, *extra: str) -> tuple[int, str]:
+        stdout = io.StringIO()
+        with patch.dict("os.environ", DEMO_ENV, clear=False), contextlib.redirect_stdout(stdout):
+            code = main(["generate", str(self.in_dir), "--out", str(self.out_dir), *extra])
+        return code, stdout.getvalue()
+
+    def test_generate_writes_exports_and_skips_unchanged_inputs(self) -> None:
+        code, output = self._run()
+        self.assertEqual(code, 0)
+        exports = sorted(p.name for p in self.out_dir.iterdir() if p.name != MANIFEST_NAME)
+        self.assertEqual(len(exports), 2)
+        self.assertTrue(any(name.startswith("crucible_rag_promptfoo_") and name.endswith(".yaml") for name in exports))
+        self.assertTrue(any(name.startswith("crucible_chatbot_raw_") and name.endswith(".json") for name in exports))
+        self.assertIn("2 generated", output)
+        self.assertIn("throughput:", output)
+
+        code, output = self._run()
+        self.assertEqual(code, 0)
+        self.assertIn("0 generated, 2 skipped", output)
+
+    def test_invalid_config_fails_without_stopping_batch(self) -> None:
+        (self.in_dir / "broken.json").write_text(json.dumps({"appType": "rag"}), encoding="utf-8")
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            code, output = self._run()
+        self.assertEqual(code, 1)
+        self.assertIn("2 generated", output)
+        self.assertIn("broken.json", stderr.getvalue())
+
+    def test_keyless_configs_share_the_ollama_cap_they_fall_back_to(self) -> None:
+        in_flight = peak = 0
+
+        async def fake_generate(details: AppDetails) -> tuple[TestSuite, str, str, str]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return TestSuite(appType=details.appType, testCases=[]), f"{details.appType}.json", "application/json", "{}"
+
+        with patch("backend.cli.generate_test_suite", side_effect=fake_generate):
+            code, _ = self._run("--concurrency", "8", "--provider-concurrency", "1")
+        self.assertEqual(code, 0)
+        self.assertEqual(peak, 1)
+
+    def test_cli_does_not_import_web_stack(self) -> None:
+        probe = "import sys, backend.cli; print('fastapi' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=Path(__file__).resolve().parents[2], capture_output=True, text=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
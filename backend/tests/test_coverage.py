@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest.mock import patch
+
+from backend.models.schemas import AppDetails, TestCase, TestSuite
+from backend.services.coverage import compute_coverage, plan_top_up
+from backend.services.generator import generate_test_suite
+from backend.services.providers.base import BaseLLMProvider
+
+
+def _case(idx: int, category: str, severity: str = "medium") -> dict:
+    return {"id": f"tc-{idx}", "category": category, "input": f"input {idx}", "severity": severity}
+
+
+def _suite(categories: list[str]) -> TestSuite:
+    return TestSuite(appType="rag", testCases=[TestCase(**_case(i, c)) for i, c in enumerate(categories)])
+
+
+class CoverageTest(unittest.TestCase):
+    def test_compute_coverage_reports_distribution_and_gaps(self) -> None:
+        suite = _suite(["happy_path", "happy_path", "adversarial", "edge_case"])
+        coverage = compute_coverage(suite)
+        self.assertEqual(coverage["categories"], {"adversarial": 1, "edge_case": 1, "happy_path": 2})
+        self.assertEqual(coverage["severities"], {"medium": 4})
+        self.assertEqual(coverage["adversarialPercent"], 50.0)
+        self.assertEqual(coverage["missingCategories"], ["hallucination_probe", "prompt_injection"])
+        self.assertFalse(coverage["meetsRequirements"])
+
+    def test_plan_top_up_fills_missing_categories_and_adversarial_share(self) -> None:
+        suite = _suite(["happy_path"] * 6 + ["adversarial", "edge_case"])
+        plan = plan_top_up(suite)
+        self.assertEqual(plan["hallucination_probe"], 1)
+        self.assertGreaterEqual(plan["prompt_injection"], 1)
+
+        topped = _suite([case.category for case in suite.testCases] + [c for c, n in plan.items() for _ in range(n)])
+        self.assertTrue(compute_coverage(topped)["meetsRequirements"])
+        self.assertEqual(plan_top_up(topped), {})
+
+    def test_edge_cases_count_toward_adversarial_share_as_the_prompt_says(self) -> None:
+        suite = _suite(["happy_path"] * 13 + ["edge_case"] * 4 + ["adversarial"] * 2 + ["hallucination_probe"])
+        suite.testCases.append(TestCase(**_case(20, "prompt_injection")))
+        coverage = compute_coverage(suite)
+        self.assertAlmostEqual(coverage["adversarialPercent"], 33.3)
+        self.assertTrue(coverage["meetsRequirements"])
+        self.assertEqual(plan_top_up(suite), {})
+
+    def test_plan_top_up_is_empty_for_compliant_suite(self) -> None:
+        suite = _suite(["happy_path", "adversarial", "edge_case", "hallucination_probe", "prompt_injection", "jailbreak"])
+        self.assertEqual(plan_top_up(suite), {})
+
+
+class FakeProvider(BaseLLMProvider):
+    def __init__(self, responses: list[str]) -> None:
+        self.responses = responses
+        self.prompts: list[str] = []
+
+    async def generate(self, system: str, user: str) -> str:
+        self.prompts.append(user)
+        return self.responses.pop(0)
+
+
+class TopUpGenerationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_generation_tops_up_only_missing_categories(self) -> None:
+        details = AppDetails(
+            appType="rag",
+            systemPrompt="You answer from policy text only.",
+            description="Support bot for return policy.",
+            domain="e-commerce",
+            provider="openai",
+            testCaseCount=10,
+            outputFormat="raw",
+        )
+        first = {"appType": "rag", "testCases": [_case(i, "happy_path") for i in range(4)] + [_case(4, "edge_case")]}
+        top_up = {
+            "appType": "rag",
+            "testCases": [
+                _case(0, "adversarial"),
+                _case(1, "prompt_injection"),
+                _case(2, "hallucination_probe"),
+                _case(3, "adversarial"),
+                _case(4, "off_topic"),
+            ],
+        }
+        provider = FakeProvider([json.dumps(first), json.dumps(top_up)])
+
+        with (
+            patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}, clear=False),
+            patch("backend.services.generator._build_provider", return_value=provider),
+        ):
+            suite, _, _, _ = await generate_test_suite(details)
+
+        self.assertEqual(len(provider.prompts), 2)
+        self.assertIn("categoryCounts", provider.prompts[1])
+        self.assertNotIn("off_topic", [case.category for case in suite.testCases])
+        self.assertEqual(len({case.id for case in suite.testCases}), suite.totalCases)
+        coverage = suite.frameworkConfig["coverage"]
+        self.assertEqual(coverage["missingCategories"], [])
+        self.assertTrue(coverage["meetsRequirements"])
+
+
+if __name__ == "__main__":
+    unittest.main()
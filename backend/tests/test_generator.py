@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import base64
+import io
 import unittest
+import zipfile
 from unittest.mock import patch
 
+from pydantic import ValidationError
+
 from backend.models.schemas import AppDetails, TestSuite
 from backend.services.generator import generate_test_suite
 
@@ -106,6 +111,32 @@ class GeneratorTest(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(mime_type, "text/x-python")
         self.assertIn("LLMTestCase(", export_content)
 
+    async def test_deepeval_shard_size_is_set_per_request(self) -> None:
+        details = AppDetails(
+            appType="rag",
+            systemPrompt="You answer from policy text only.",
+            description="Support bot for return policy.",
+            domain="e-commerce",
+            provider="openai",
+            testCaseCount=10,
+            outputFormat="deepeval-sharded",
+            deepevalShardSize=4,
+        )
+
+        with patch.dict(
+            "os.environ",
+            {"DEMO_MODE_ENABLED": "true", "OPENAI_API_KEY": "", "OLLAMA_BASE_URL": "http://127.0.0.1:9"},
+            clear=False,
+        ):
+            suite, _, _, export_content = await generate_test_suite(details)
+
+        archive = zipfile.ZipFile(io.BytesIO(base64.b64decode(export_content)))
+        shards = [name for name in archive.namelist() if "/test_shard_" in name]
+        self.assertEqual(len(shards), 3)
+        self.assertEqual(suite.frameworkConfig["shardSize"], 4)
+        with self.assertRaises(ValidationError):
+            details.model_validate(details.model_dump() | {"deepevalShardSize": -1})
+
 
 if __name__ == "__main__":
     unittest.main()
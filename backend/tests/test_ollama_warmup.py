@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import unittest
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+
+from backend.models.schemas import AppDetails
+from backend.services.generator import generate_test_suite
+from backend.services.ollama_readiness import (
+    ollama_known_down,
+    record_ollama_readiness,
+    warm_up_ollama,
+    warmup_enabled,
+)
+from backend.services.providers.ollama_provider import OllamaProvider
+from backend.services.state import MemoryStateBackend
+
+OLLAMA_ENV = {
+    "OLLAMA_BASE_URL": "http://ollama.test",
+    "OLLAMA_MODEL_NAME": "deepseek-r1",
+    "OLLAMA_KEEP_ALIVE": "-1",
+    "OLLAMA_NUM_CTX": "8192",
+    "OLLAMA_NUM_THREAD": "4",
+}
+
+
+class FakeOllama:
+    def __init__(self, models: list[str]) -> None:
+        self.models = models
+        self.requests: list[tuple[str, dict]] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else {}
+        self.requests.append((request.url.path, body))
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": [{"name": name} for name in self.models]})
+        if request.url.path == "/api/generate":
+            return httpx.Response(200, json={"done": True})
+        return httpx.Response(200, json={"message": {"content": "{}"}})
+
+    def patch_client(self) -> Any:
+        real_client = httpx.AsyncClient
+        transport = httpx.MockTransport(self.handler)
+        return patch.object(httpx, "AsyncClient", lambda **kwargs: real_client(transport=transport, **kwargs))
+
+
+class OllamaWarmupTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.state = MemoryStateBackend()
+        state_patch = patch("backend.services.ollama_readiness.get_state_backend", return_value=self.state)
+        state_patch.start()
+        self.addCleanup(state_patch.stop)
+
+    async def test_warm_up_pins_model_with_keep_alive_and_options(self) -> None:
+        fake = FakeOllama(["deepseek-r1:latest"])
+        with patch.dict("os.environ", OLLAMA_ENV, clear=False), fake.patch_client():
+            self.assertTrue(await warm_up_ollama())
+
+        self.assertEqual([path for path, _ in fake.requests], ["/api/tags", "/api/generate"])
+        load = fake.requests[1][1]
+        self.assertEqual(load["keep_alive"], -1)
+        self.assertEqual(load["options"], {"num_ctx": 8192, "num_thread": 4})
+        self.assertFalse(ollama_known_down())
+
+    async def test_missing_model_is_recorded_as_down_without_loading(self) -> None:
+        fake = FakeOllama(["llama3.1:latest"])
+        with patch.dict("os.environ", OLLAMA_ENV, clear=False), fake.patch_client():
+            self.assertFalse(await warm_up_ollama())
+
+        self.assertEqual([path for path, _ in fake.requests], ["/api/tags"])
+        self.assertTrue(ollama_known_down())
+
+    async def test_chat_requests_carry_keep_alive_and_options(self) -> None:
+        fake = FakeOllama([])
+        with patch.dict("os.environ", OLLAMA_ENV, clear=False), fake.patch_client():
+            await OllamaProvider().generate("system", "user")
+
+        path, body = fake.requests[0]
+        self.assertEqual(path, "/api/chat")
+        self.assertEqual(body["keep_alive"], -1)
+        self.assertEqual(body["options"]["num_ctx"], 8192)
+
+    async def test_known_down_skips_straight_to_static_demo(self) -> None:
+        record_ollama_readiness(False)
+        details = AppDetails(
+            appType="rag",
+            systemPrompt="You answer from policy text only.",
+            description="Support bot for return policy.",
+            domain="e-commerce",
+            provider="openai",
+            testCaseCount=10,
+            outputFormat="raw",
+        )
+        with (
+            patch.dict("os.environ", {"DEMO_MODE_ENABLED": "true", "OPENAI_API_KEY": ""}, clear=False),
+            patch("backend.services.generator._generate_with_provider") as generate_with_provider,
+        ):
+            suite, _, _, _ = await generate_test_suite(details)
+
+        generate_with_provider.assert_not_called()
+        self.assertEqual(suite.frameworkConfig["mode"], "demo-static")
+
+
+class WarmupDefaultTest(unittest.TestCase):
+    def _enabled(self, **env: str) -> bool:
+        base = {
+            "OLLAMA_WARMUP_ENABLED": "",
+            "DEFAULT_PROVIDER": "openai",
+            "DEMO_MODE_ENABLED": "true",
+            "OPENAI_API_KEY": "",
+            "ANTHROPIC_API_KEY": "",
+            "GOOGLE_API_KEY": "",
+        }
+        with patch.dict("os.environ", base | env, clear=False):
+            return warmup_enabled()
+
+    def test_defaults_follow_whether_ollama_is_used(self) -> None:
+        self.assertTrue(self._enabled())
+        self.assertFalse(self._enabled(OPENAI_API_KEY="sk-test"))
+        self.assertFalse(self._enabled(DEMO_MODE_ENABLED="false"))
+        self.assertTrue(self._enabled(OPENAI_API_KEY="sk-test", DEFAULT_PROVIDER="ollama"))
+
+    def test_explicit_setting_wins(self) -> None:
+        self.assertTrue(self._enabled(OLLAMA_WARMUP_ENABLED="true", OPENAI_API_KEY="sk-test"))
+        self.assertFalse(self._enabled(OLLAMA_WARMUP_ENABLED="false"))
+
+
+if __name__ == "__main__":
+    unittest.main()
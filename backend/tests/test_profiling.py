@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.profiling import PROFILE_ID_HEADER, ProfileStore
+
+PAYLOAD = {
+    "appType": "rag",
+    "systemPrompt": "You answer only from approved docs.",
+    "description": "Policy QA assistant",
+    "domain": "e-commerce",
+    "provider": "openai",
+    "testCaseCount": 10,
+    "outputFormat": "promptfoo",
+    "exampleInteractions": [],
+}
+
+
+class ProfilingApiTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = TestClient(app)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.env = {
+            "DEMO_MODE_ENABLED": "true",
+            "OPENAI_API_KEY": "",
+            "OLLAMA_BASE_URL": "http://127.0.0.1:9",
+            "PROFILE_DIR": tmp.name,
+            "ADMIN_TOKEN": "secret",
+        }
+
+    def test_profile_is_captured_and_downloadable_when_enabled(self) -> None:
+        with patch.dict("os.environ", self.env | {"PROFILING_ENABLED": "true"}, clear=False):
+            response = self.client.post("/generate?profile=1", json=PAYLOAD)
+            self.assertEqual(response.status_code, 200)
+            profile_id = response.headers[PROFILE_ID_HEADER]
+
+            self.assertEqual(self.client.get("/admin/profiles").status_code, 401)
+            listing = self.client.get("/admin/profiles", headers={"X-Admin-Token": "secret"}).json()
+            self.assertEqual([item["id"] for item in listing], [profile_id])
+
+            download = self.client.get(f"/admin/profiles/{profile_id}", headers={"X-Admin-Token": "secret"})
+            self.assertEqual(download.status_code, 200)
+            profile = download.json()
+            self.assertEqual(profile["profiles"][0]["type"], "sampled")
+            self.assertEqual(len(profile["profiles"][0]["samples"]), len(profile["profiles"][0]["weights"]))
+
+            missing = self.client.get("/admin/profiles/../../etc", headers={"X-Admin-Token": "secret"})
+            self.assertEqual(missing.status_code, 404)
+
+    def test_failed_request_still_points_at_its_profile(self) -> None:
+        env = self.env | {"PROFILING_ENABLED": "true", "DEMO_MODE_ENABLED": "false"}
+        with patch.dict("os.environ", env, clear=False):
+            response = self.client.post("/generate?profile=1", json=PAYLOAD)
+            self.assertEqual(response.status_code, 503)
+            profile_id = response.headers[PROFILE_ID_HEADER]
+            listing = self.client.get("/admin/profiles", headers={"X-Admin-Token": "secret"}).json()
+            self.assertEqual([item["id"] for item in listing], [profile_id])
+
+    def test_admin_endpoints_fail_closed_without_token(self) -> None:
+        env = self.env | {"PROFILING_ENABLED": "true", "ADMIN_TOKEN": ""}
+        with patch.dict("os.environ", env, clear=False):
+            self.assertEqual(self.client.get("/admin/profiles").status_code, 503)
+            self.assertEqual(self.client.get("/admin/profiles", headers={"X-Admin-Token": ""}).status_code, 503)
+
+    def test_flag_is_ignored_when_server_disallows_profiling(self) -> None:
+        with patch.dict("os.environ", self.env | {"PROFILING_ENABLED": "false"}, clear=False):
+            response = self.client.post("/generate", json=PAYLOAD, headers={"X-Crucible-Profile": "1"})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn(PROFILE_ID_HEADER, response.headers)
+            self.assertEqual(self.client.get("/admin/profiles").status_code, 503)
+        self.assertEqual(os.listdir(self.env["PROFILE_DIR"]), [])
+
+
+class ProfileStoreTest(unittest.TestCase):
+    def test_retention_keeps_newest_profiles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ProfileStore(Path(tmp), max_count=2, max_age_seconds=3600)
+            ids = []
+            for _ in range(3):
+                ids.append(store.save({"profiles": []}))
+                time.sleep(0.01)
+            self.assertEqual({item["id"] for item in store.list()}, set(ids[1:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
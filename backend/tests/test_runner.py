@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import ast
+import asyncio
+import contextlib
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from backend.cli import main
+from backend.main import app
+from backend.models.schemas import TestCase, TestSuite
+from backend.services.generator import build_results_export
+from backend.services.runner import CallableTarget, HttpTarget, run_suite
+
+
+class StandInApp(BaseHTTPRequestHandler):
+    """Local stand-in for an app under test.
+
+    Inputs starting with "flaky" fail with 503 on the first attempt, "slow" inputs
+    sleep past the test timeout, and "bad" inputs get a non-retryable 400.
+    """
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    attempts: dict[str, int] = {}
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = body["question"] if "question" in body else body["input"]
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.attempts[text] = cls.attempts.get(text, 0) + 1
+            attempt = cls.attempts[text]
+        try:
+            time.sleep(1.0 if text.startswith("slow") else 0.02)
+            if text.startswith("bad"):
+                self._reply(400, {"error": "bad request"})
+            elif text.startswith("flaky") and attempt == 1:
+                self._reply(503, {"error": "warming up"})
+            else:
+                self._reply(200, {"output": f"echo: {text}", "contexts": [f"doc for {text}"]})
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _reply(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        with contextlib.suppress(ConnectionError):  # the runner hangs up on timed-out cases
+            self.wfile.write(data)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def _suite(inputs: list[str]) -> TestSuite:
+    cases = [TestCase(id=f"tc-{i:03d}", category="happy_path", input=text) for i, text in enumerate(inputs)]
+    return TestSuite(appType="rag", testCases=cases)
+
+
+def answer(text: str) -> dict:
+    return {"output": text.upper(), "retrieval_context": ["ctx"]}
+
+
+class StandInTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        StandInApp.in_flight = StandInApp.max_in_flight = 0
+        StandInApp.attempts = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInApp)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/chat"
+
+
+class RunnerTest(StandInTestCase):
+    async def _run(self, suite: TestSuite, **kwargs: object):
+        async with HttpTarget(self.url) as target:
+            return await run_suite(suite, target, backoff_seconds=0.01, **kwargs)
+
+    def test_bounded_concurrency_fills_every_case_in_suite_order(self) -> None:
+        suite = _suite([f"question {i}" for i in range(20)])
+        progress: list[int] = []
+        report = asyncio.run(self._run(suite, concurrency=4, on_result=lambda _, done, total: progress.append(done)))
+
+        self.assertEqual([r.id for r in report.results], [case.id for case in suite.testCases])
+        self.assertTrue(all(r.status == "ok" for r in report.results))
+        self.assertEqual(report.results[3].output, "echo: question 3")
+        self.assertEqual(report.results[3].contexts, ["doc for question 3"])
+        self.assertLessEqual(StandInApp.max_in_flight, 4)
+        self.assertGreater(StandInApp.max_in_flight, 1)
+        self.assertEqual(progress, list(range(1, 21)))
+        summary = report.summary()
+        self.assertEqual(summary["succeeded"], 20)
+        self.assertGreater(summary["casesPerSecond"], 0)
+        self.assertIn("p95", summary["latency"])
+
+    def test_retries_timeouts_and_client_errors(self) -> None:
+        suite = _suite(["flaky one", "slow one", "bad one"])
+        report = asyncio.run(self._run(suite, timeout_seconds=0.3, retries=1))
+        flaky, slow, bad = report.results
+
+        self.assertEqual((flaky.status, flaky.attempts), ("ok", 2))
+        self.assertEqual((slow.status, slow.attempts), ("failed", 2))
+        self.assertIn("timed out", slow.error or "")
+        self.assertEqual((bad.status, bad.attempts), ("failed", 1))
+        self.assertEqual(report.summary()["retried"], 2)
+
+    def test_callable_target_and_results_export(self) -> None:
+        suite = _suite(["first", "second"])
+        report = asyncio.run(run_suite(suite, CallableTarget(answer)))
+        _, _, content, _ = build_results_export(suite, "ragas", report.results_by_id())
+        dataset = json.loads(content)
+        self.assertEqual(dataset["answer"], ["FIRST", "SECOND"])
+        self.assertEqual(dataset["contexts"], [["ctx"], ["ctx"]])
+
+        _, _, source, _ = build_results_export(suite, "deepeval", report.results_by_id())
+        ast.parse(source)
+        self.assertIn('actual_output="FIRST"', source)
+        self.assertNotIn("fill at runtime", source)
+        with self.assertRaises(ValueError):
+            build_results_export(suite, "promptfoo", {})
+
+
+class RunApiTest(StandInTestCase):
+    def test_disabled_by_default(self) -> None:
+        payload = {"suite": _suite(["hi"]).model_dump(), "target": {"url": self.url}}
+        with patch.dict("os.environ", {"RUNNER_API_ENABLED": "false"}, clear=False):
+            response = TestClient(app).post("/run", json=payload)
+        self.assertEqual(response.status_code, 503)
+
+    def test_streams_progress_then_summary_with_export(self) -> None:
+        payload = {
+            "suite": _suite(["alpha", "beta", "flaky gamma"]).model_dump(),
+            "target": {"url": self.url, "inputField": "question"},
+            "outputFormat": "ragas-jsonl",
+            "concurrency": 2,
+            "retries": 1,
+        }
+        env = {"RUNNER_API_ENABLED": "true", "RUNNER_ALLOWED_HOSTS": "127.0.0.1"}
+        with patch.dict("os.environ", env, clear=False):
+            response = TestClient(app).post("/run", json=payload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([line["type"] for line in lines], ["result"] * 3 + ["summary"])
+        self.assertEqual(sorted(line["completed"] for line in lines[:3]), [1, 2, 3])
+        summary = lines[-1]
+        self.assertEqual(summary["report"]["succeeded"], 3)
+        rows = [json.loads(row) for row in summary["exportContent"].splitlines()]
+        self.assertEqual([row["answer"] for row in rows], ["echo: alpha", "echo: beta", "echo: flaky gamma"])
+
+    def test_requires_an_allow_list_when_enabled(self) -> None:
+        payload = {"suite": _suite(["hi"]).model_dump(), "target": {"url": "http://169.254.169.254/latest"}}
+        env = {"RUNNER_API_ENABLED": "true", "RUNNER_ALLOWED_HOSTS": ""}
+        with patch.dict("os.environ", env, clear=False):
+            response = TestClient(app).post("/run", json=payload)
+        self.assertEqual(response.status_code, 503)
+
+    def test_rejects_hosts_outside_allow_list(self) -> None:
+        payload = {"suite": _suite(["hi"]).model_dump(), "target": {"url": self.url}}
+        env = {"RUNNER_API_ENABLED": "true", "RUNNER_ALLOWED_HOSTS": "evals.internal"}
+        with patch.dict("os.environ", env, clear=False):
+            response = TestClient(app).post("/run", json=payload)
+        self.assertEqual(response.status_code, 403)
+
+
+class RunCliTest(StandInTestCase):
+    def test_run_writes_filled_export_and_reports_latency(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            suite_path = root / "suite.json"
+            suite_path.write_text(json.dumps({"suite": _suite(["one", "two"]).model_dump()}), encoding="utf-8")
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                code = main(["run", str(suite_path), "--target", self.url, "--format", "ragas", "--out", str(root / "out")])
+
+            self.assertEqual(code, 0)
+            self.assertIn("[2/2] ok", stderr.getvalue())
+            self.assertIn("throughput:", stdout.getvalue())
+            (export,) = (root / "out").iterdir()
+            self.assertIn("_ragas_results_", export.name)
+            self.assertEqual(json.loads(export.read_text())["answer"], ["echo: one", "echo: two"])
+
+
+if __name__ == "__main__":
+    unittest.main()
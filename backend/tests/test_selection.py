@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import TestCase, TestSuite
+from backend.services.selection import select_smoke_subset
+
+CATEGORIES = ["happy_path", "adversarial", "edge_case", "prompt_injection", "jailbreak", "off_topic"]
+SEVERITIES = ["critical", "high", "medium", "low"]
+
+
+def _suite(size: int) -> TestSuite:
+    cases = [
+        TestCase(
+            id=f"tc-{i}",
+            category=CATEGORIES[i % len(CATEGORIES)],
+            severity=SEVERITIES[(i // len(CATEGORIES)) % len(SEVERITIES)],
+            input=f"question {i} about topic {i % 37} with detail {i % 11}",
+            expectedOutput="Answer from policy.",
+        )
+        for i in range(size)
+    ]
+    return TestSuite(appType="rag", testCases=cases)
+
+
+class SmokeSelectionTest(unittest.TestCase):
+    def test_selection_is_deterministic_per_seed(self) -> None:
+        suite = _suite(200)
+        first, _ = select_smoke_subset(suite, max_cases=20, seed=7)
+        second, _ = select_smoke_subset(suite, max_cases=20, seed=7)
+        other, _ = select_smoke_subset(suite, max_cases=20, seed=8)
+        ids = [case.id for case in first.testCases]
+        self.assertEqual(ids, [case.id for case in second.testCases])
+        self.assertNotEqual(ids, [case.id for case in other.testCases])
+
+    def test_covers_every_category_and_prefers_severe_cases(self) -> None:
+        subset, stats = select_smoke_subset(_suite(240), max_cases=12)
+        self.assertEqual(stats["selectedCases"], 12)
+        self.assertEqual({case.category for case in subset.testCases}, set(CATEGORIES))
+        self.assertEqual({case.severity for case in subset.testCases}, {"critical", "high"})
+
+    def test_token_and_time_budgets_are_respected(self) -> None:
+        _, by_tokens = select_smoke_subset(_suite(100), max_tokens=100)
+        self.assertLessEqual(by_tokens["estimatedTokens"], 100)
+        _, by_seconds = select_smoke_subset(_suite(100), max_seconds=30)
+        self.assertLessEqual(by_seconds["estimatedSeconds"], 30)
+        self.assertGreater(by_seconds["selectedCases"], 0)
+
+    def test_requires_a_budget(self) -> None:
+        with self.assertRaises(ValueError):
+            select_smoke_subset(_suite(5))
+
+    def test_large_suites_select_quickly(self) -> None:
+        suite = _suite(5000)
+        started = time.perf_counter()
+        _, stats = select_smoke_subset(suite, max_cases=500)
+        self.assertEqual(stats["selectedCases"], 500)
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+
+class SmokeApiTest(unittest.TestCase):
+    def test_generate_returns_smoke_export_alongside_full_suite(self) -> None:
+        payload = {
+            "appType": "rag",
+            "systemPrompt": "You answer only from approved docs.",
+            "description": "Policy QA assistant",
+            "domain": "e-commerce",
+            "provider": "openai",
+            "testCaseCount": 25,
+            "outputFormat": "promptfoo",
+            "smokeBudget": {"maxCases": 5, "seed": 3},
+        }
+        env = {"DEMO_MODE_ENABLED": "true", "OPENAI_API_KEY": "", "OLLAMA_BASE_URL": "http://127.0.0.1:9"}
+        with patch.dict("os.environ", env, clear=False):
+            response = TestClient(app).post("/generate", json=payload)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["suite"]["totalCases"], 25)
+        smoke = body["smoke"]
+        self.assertEqual(smoke["suite"]["totalCases"], 5)
+        self.assertIn("_promptfoo_smoke_", smoke["exportFilename"])
+        self.assertEqual(smoke["suite"]["frameworkConfig"]["selection"]["seed"], 3)
+
+    def test_smoke_budget_without_limits_is_rejected(self) -> None:
+        payload = {
+            "appType": "rag",
+            "systemPrompt": "You answer only from approved docs.",
+            "description": "Policy QA assistant",
+            "domain": "e-commerce",
+            "smokeBudget": {"seed": 1},
+        }
+        self.assertEqual(TestClient(app).post("/generate", json=payload).status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.models.schemas import AppDetails, TestSuite
+from backend.services import generator
+from backend.services.state import MemoryStateBackend, SQLiteStateBackend, StateBackend
+
+
+class StateBackendContract:
+    def make_backend(self) -> StateBackend:
+        raise NotImplementedError
+
+    def test_set_get_and_expiry(self) -> None:
+        backend = self.make_backend()
+        backend.set("a", b"1")
+        backend.set("b", b"2", ttl_seconds=0.05)
+        self.assertEqual(backend.get("a"), b"1")
+        self.assertEqual(backend.get("b"), b"2")
+        time.sleep(0.06)
+        self.assertIsNone(backend.get("b"))
+
+    def test_add_only_succeeds_once(self) -> None:
+        backend = self.make_backend()
+        self.assertTrue(backend.add("job", b"running", ttl_seconds=10))
+        self.assertFalse(backend.add("job", b"running", ttl_seconds=10))
+        backend.delete("job")
+        self.assertTrue(backend.add("job", b"running", ttl_seconds=10))
+
+    def test_incr_window_counts_calls(self) -> None:
+        backend = self.make_backend()
+        self.assertEqual([backend.incr_window("budget:openai", 60) for _ in range(3)], [1, 2, 3])
+
+
+class MemoryStateBackendTest(StateBackendContract, unittest.TestCase):
+    def make_backend(self) -> StateBackend:
+        return MemoryStateBackend()
+
+    def test_writes_drop_expired_keys_that_are_never_read(self) -> None:
+        backend = MemoryStateBackend()
+        for index in range(200):
+            backend.set(f"export:{index}:identity", b"body", ttl_seconds=0.01)
+        time.sleep(0.02)
+        backend.set("fresh", b"1")
+        self.assertEqual(list(backend._items), ["fresh"])
+
+    def test_evicts_least_recently_used_keys_beyond_max_bytes(self) -> None:
+        backend = MemoryStateBackend(max_bytes=30)
+        backend.set("a", b"x" * 10)
+        backend.set("b", b"x" * 10)
+        backend.set("c", b"x" * 10)
+        backend.get("a")
+        backend.set("d", b"x" * 10)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual([backend.get(key) for key in "acd"], [b"x" * 10] * 3)
+
+
+class SQLiteStateBackendTest(StateBackendContract, unittest.TestCase):
+    def make_backend(self) -> StateBackend:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return SQLiteStateBackend(Path(tmp.name) / "state.sqlite3")
+
+    def test_connections_share_state(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "state.sqlite3"
+            first, second = SQLiteStateBackend(path), SQLiteStateBackend(path)
+            self.assertTrue(first.add("job", b"running", ttl_seconds=10))
+            self.assertFalse(second.add("job", b"running", ttl_seconds=10))
+            first.incr_window("budget:openai", 60)
+            self.assertEqual(second.incr_window("budget:openai", 60), 2)
+
+
+class SharedGenerationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_identical_requests_generate_once(self) -> None:
+        details = AppDetails(
+            appType="rag",
+            systemPrompt="You answer from policy text only.",
+            description="Support bot for return policy.",
+            domain="e-commerce",
+            provider="openai",
+            testCaseCount=10,
+            outputFormat="raw",
+        )
+        calls = 0
+
+        async def fake_generate_with_provider(details_obj: AppDetails) -> TestSuite:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return TestSuite(appType="rag", testCases=[])
+
+        with (
+            patch.dict("os.environ", {"RESPONSE_CACHE_TTL_SECONDS": "60", "OPENAI_API_KEY": "sk-test"}, clear=False),
+            patch("backend.services.generator.get_state_backend", return_value=MemoryStateBackend()),
+            patch("backend.services.generator._generate_with_provider", side_effect=fake_generate_with_provider),
+            patch.object(generator, "JOB_POLL_INTERVAL_SECONDS", 0.01),
+        ):
+            results = await asyncio.gather(*(generator.generate_test_suite(details) for _ in range(3)))
+
+        self.assertEqual(calls, 1)
+        self.assertEqual({filename for _, filename, _, _ in results}, {results[0][1]})
+        self.assertTrue(all(suite.frameworkConfig.get("mode") == "live" for suite, _, _, _ in results))
+
+    def test_job_marker_outlives_worst_case_generation(self) -> None:
+        env = {"LOCAL_LLM_TIMEOUT_SECONDS": "120", "COVERAGE_TOP_UP_ROUNDS": "1"}
+        with patch.dict("os.environ", env, clear=False):
+            # Two attempts plus one top-up round, each allowed 130s.
+            self.assertGreaterEqual(generator._job_ttl(), 3 * 130)
+
+    async def test_provider_budget_rejects_excess_calls(self) -> None:
+        with (
+            patch.dict("os.environ", {"PROVIDER_REQUESTS_PER_MINUTE": "1"}, clear=False),
+            patch("backend.services.generator.get_state_backend", return_value=MemoryStateBackend()),
+        ):
+            generator._consume_provider_budget("openai")
+            with self.assertRaises(RuntimeError) as ctx:
+                generator._consume_provider_budget("openai")
+
+        self.assertIn("rate limit exceeded", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,16 @@ export type AppDetails = {
   provider: Provider;
   testCaseCount: 10 | 25 | 50;
   outputFormat: OutputFormat;
+  smokeBudget?: {
+    maxCases?: number;
+    maxTokens?: number;
+    maxSeconds?: number;
+    seed?: number;
+  };
+  mutationsPerSeed?: number;
+  mutationSeed?: number;
+  compactJson?: boolean;
+  deepevalShardSize?: number;
 };
 
 export type TestCategory =
@@ -54,4 +64,14 @@ export type GenerateResponse = {
   exportFilename: string;
   exportMimeType: string;
   exportContent: string;
+  exportEncoding?: "utf-8" | "base64";
+  exportRef?: string;
+  exportUrl?: string;
+  smoke?: {
+    suite: TestSuite;
+    exportFilename: string;
+    exportMimeType: string;
+    exportContent: string;
+    exportEncoding?: "utf-8" | "base64";
+  };
 };